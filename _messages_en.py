@@ -0,0 +1,16 @@
+MESSAGES = {
+    "window_title": "Choose mode",
+    "app_title": "LedFx iCUE Bridge",
+    "choose_mode": "Choose the mode (default: {default_mode})",
+    "mode_selected": "Selected mode: {mode}",
+    "mode_unique": "Unique",
+    "mode_group": "Group",
+    "mode_fusion": "Fusion",
+    "quit": "Quit",
+    "confirm_close_title": "Confirm exit",
+    "confirm_close_body": "Do you want to close the program?",
+    "update_available_title": "Update available",
+    "update_available_body": "A new version is available ({version}). Download now?",
+    "update_available_console": "Update available: {version} -> {url}",
+    "toggle_language": "Language",
+}
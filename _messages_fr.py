@@ -0,0 +1,16 @@
+MESSAGES = {
+    "window_title": "Choisir mode",
+    "app_title": "LedFx iCUE Bridge",
+    "choose_mode": "Choisir le mode (defaut: {default_mode})",
+    "mode_selected": "Mode selectionne: {mode}",
+    "mode_unique": "Unique",
+    "mode_group": "Groupe",
+    "mode_fusion": "Fusion",
+    "quit": "Quitter",
+    "confirm_close_title": "Confirmer la fermeture",
+    "confirm_close_body": "Voulez-vous fermer le programme ?",
+    "update_available_title": "Mise a jour disponible",
+    "update_available_body": "Nouvelle version disponible ({version}). Telecharger maintenant ?",
+    "update_available_console": "Nouvelle version disponible: {version} -> {url}",
+    "toggle_language": "Langue",
+}
@@ -1,47 +1,74 @@
+import functools
+import importlib
 import locale
 import os
+import string
+import sys
+import types
 
 
-_MESSAGES = {
-    "fr": {
-        "window_title": "Choisir mode",
-        "app_title": "LedFx iCUE Bridge",
-        "choose_mode": "Choisir le mode (defaut: {default_mode})",
-        "mode_selected": "Mode selectionne: {mode}",
-        "mode_unique": "Unique",
-        "mode_group": "Groupe",
-        "mode_fusion": "Fusion",
-        "quit": "Quitter",
-        "confirm_close_title": "Confirmer la fermeture",
-        "confirm_close_body": "Voulez-vous fermer le programme ?",
-        "update_available_title": "Mise a jour disponible",
-        "update_available_body": "Nouvelle version disponible ({version}). Telecharger maintenant ?",
-        "update_available_console": "Nouvelle version disponible: {version} -> {url}",
-        "toggle_language": "Langue",
-    },
-    "en": {
-        "window_title": "Choose mode",
-        "app_title": "LedFx iCUE Bridge",
-        "choose_mode": "Choose the mode (default: {default_mode})",
-        "mode_selected": "Selected mode: {mode}",
-        "mode_unique": "Unique",
-        "mode_group": "Group",
-        "mode_fusion": "Fusion",
-        "quit": "Quit",
-        "confirm_close_title": "Confirm exit",
-        "confirm_close_body": "Do you want to close the program?",
-        "update_available_title": "Update available",
-        "update_available_body": "A new version is available ({version}). Download now?",
-        "update_available_console": "Update available: {version} -> {url}",
-        "toggle_language": "Language",
-    },
+_LOADERS = {
+    "fr": lambda: _load("fr"),
+    "en": lambda: _load("en"),
 }
+_CACHE = {}
+_FORMATTER = string.Formatter()
+
+
+def _load(lang):
+    messages = importlib.import_module(f"_messages_{lang}").MESSAGES
+    return {sys.intern(k): v for k, v in messages.items()}
+
+
+def _compile_template(msg):
+    if "{" not in msg:
+        return None
+    parts = []
+    try:
+        for literal, field, spec, conv in _FORMATTER.parse(msg):
+            if spec or conv or (field is not None and not field.isidentifier()):
+                return None
+            parts.append((literal, field))
+    except ValueError:
+        return None
+    return tuple(parts)
+
+
+def _compile_messages(messages):
+    compiled = {}
+    for key, msg in messages.items():
+        parts = _compile_template(msg)
+        if parts is not None:
+            compiled[key] = parts
+    return compiled
+
+
+def _get_catalog(lang):
+    catalog = _CACHE.get(lang)
+    if catalog is not None:
+        return catalog
+    try:
+        loader = _LOADERS[lang]
+    except KeyError:
+        lang = "fr"
+        loader = _LOADERS[lang]
+    messages = loader()
+    catalog = (
+        types.MappingProxyType(messages),
+        types.MappingProxyType(_compile_messages(messages)),
+    )
+    return _CACHE.setdefault(lang, catalog)
 
 
 def _normalize_lang(value):
     if not value:
         return None
-    v = str(value).strip().lower()
+    return _normalize_lang_str(str(value))
+
+
+@functools.lru_cache(maxsize=32)
+def _normalize_lang_str(value):
+    v = value.strip().lower()
     if v.startswith("fr"):
         return "fr"
     if v.startswith("en"):
@@ -49,6 +76,7 @@ def _normalize_lang(value):
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def _detect_lang():
     env_lang = _normalize_lang(os.environ.get("LEDFX_UI_LANG"))
     if env_lang:
@@ -64,20 +92,37 @@ def _detect_lang():
 class I18n:
     def __init__(self, lang=None):
         self.lang = _normalize_lang(lang) or _detect_lang()
+        self._msgs = None
+        self._compiled = None
 
     def set_lang(self, lang):
         normalized = _normalize_lang(lang)
-        if normalized:
+        if normalized and normalized != self.lang:
             self.lang = normalized
+            self._msgs = None
+            self._compiled = None
 
     def t(self, key, **kwargs):
-        msg = _MESSAGES.get(self.lang, _MESSAGES["fr"]).get(key, key)
-        if kwargs:
+        msgs = self._msgs
+        if msgs is None:
+            msgs, self._compiled = _get_catalog(self.lang)
+            self._msgs = msgs
+        msg = msgs.get(key, key)
+        if not kwargs:
+            return msg
+        parts = self._compiled.get(key)
+        if parts is None:
             try:
                 return msg.format(**kwargs)
             except Exception:
                 return msg
-        return msg
+        try:
+            return "".join(
+                literal if field is None else literal + str(kwargs[field])
+                for literal, field in parts
+            )
+        except KeyError:
+            return msg
 
 
 def get_i18n(cfg=None, lang=None):
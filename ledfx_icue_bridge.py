@@ -1,15 +1,35 @@
 #!/usr/bin/env python3
-import argparse
+import functools
 import sys
+import types
 
-import ledfx_icue_core as core
 
+_ARG_DEFAULTS = {
+    "config": "config.json",
+    "list_devices": False,
+    "list_groups": False,
+    "test": False,
+    "test_color": None,
+    "debug_udp": False,
+    "debug_icue": False,
+    "mode": None,
+    "group_port": None,
+    "fusion_port": None,
+    "fan_sweep": False,
+    "fan_index": 1,
+    "fan_speed": 0.08,
+    "fan_group": "ventilos",
+    "fan_on": None,
+    "fan_color": "255,255,255",
+}
 
+
+@functools.lru_cache(maxsize=1)
 def build_arg_parser():
+    import argparse
+
     parser = argparse.ArgumentParser(description="LedFx UDP -> Corsair iCUE bridge")
-    parser.add_argument(
-        "--config", default="config.json", help="Chemin vers config.json"
-    )
+    parser.add_argument("--config", help="Chemin vers config.json")
     parser.add_argument("--list-devices", action="store_true")
     parser.add_argument("--list-groups", action="store_true")
     parser.add_argument("--test", action="store_true", help="Test LEDs (rouge)")
@@ -23,17 +43,36 @@ def build_arg_parser():
     parser.add_argument("--group-port", type=int)
     parser.add_argument("--fusion-port", type=int)
     parser.add_argument("--fan-sweep", action="store_true")
-    parser.add_argument("--fan-index", type=int, default=1)
-    parser.add_argument("--fan-speed", type=float, default=0.08)
-    parser.add_argument("--fan-group", default="ventilos")
+    parser.add_argument("--fan-index", type=int)
+    parser.add_argument("--fan-speed", type=float)
+    parser.add_argument("--fan-group")
     parser.add_argument("--fan-on", help="Allumer uniquement certains ventilos (ex: 1,2)")
-    parser.add_argument("--fan-color", default="255,255,255")
+    parser.add_argument("--fan-color")
+    # Une seule source de defauts, partagee avec _parse_args_fast
+    parser.set_defaults(**_ARG_DEFAULTS)
     return parser
 
 
+def _parse_args_fast(argv):
+    # Cas courant (aucun argument ou seulement --config): pas besoin d'argparse.
+    config = _ARG_DEFAULTS["config"]
+    if len(argv) == 1 and argv[0].startswith("--config="):
+        config = argv[0][len("--config="):]
+    elif len(argv) == 2 and argv[0] == "--config" and not argv[1].startswith("-"):
+        config = argv[1]
+    elif argv:
+        return None
+    if not config:
+        return None
+    return types.SimpleNamespace(**dict(_ARG_DEFAULTS, config=config))
+
+
 def main():
-    parser = build_arg_parser()
-    args = parser.parse_args()
+    args = _parse_args_fast(sys.argv[1:])
+    if args is None:
+        args = build_arg_parser().parse_args()
+    import ledfx_icue_core as core
+
     return core.run_bridge(args)
 
 
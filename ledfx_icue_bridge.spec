@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('C:\\Users\\youtu\\Documents\\corsair custom\\config.json', '.')],
-    hiddenimports=[],
+    hiddenimports=['_messages_fr', '_messages_en'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
+import functools
+import itertools
 import json
 import logging
+import operator
 import os
 import pathlib
 import socket
 import selectors
+import struct
 import sys
 import time
 import threading
@@ -14,7 +18,6 @@ import urllib.request
 import urllib.error
 import webbrowser
 import i18n
-import
 try:
     import msvcrt
     _HAS_MSVCRT = True
@@ -27,38 +30,110 @@ try:
 except ImportError:
     psutil = None
     _HAS_PSUTIL = False
+_HAS_SCHED_AFFINITY = hasattr(os, "sched_setaffinity")
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    _HAS_ORJSON = False
 
 APP_VERSION = "0.2.0"
 
 _MODE_WINDOW = None
 _MODE_EXIT = "__exit__"
 _I18N = None
+_VERSION_SPLIT_RE = re.compile(r"[._\-+]")
+_LEADING_DIGITS_RE = re.compile(r"(\d+)")
+_RGB_TRANSLATE = str.maketrans({";": ",", " ": None, "\t": None})
+_LIST_SEP_TRANSLATE = str.maketrans({";": ","})
+_TYPE_SEP_RE = re.compile(r"[,|]")
+_BRIDGE_SELECTOR = None
+_UDP_RCVBUF = 262144
+_UDP_DRAIN_MAX = 32
+_UDP_SOCK_NONBLOCK = hasattr(socket, "SOCK_NONBLOCK")
+_UDP_SOCK_TYPE = (
+    socket.SOCK_DGRAM
+    | getattr(socket, "SOCK_NONBLOCK", 0)
+    | getattr(socket, "SOCK_CLOEXEC", 0)
+)
+_FRAME_BUFFER_POOL = {}
+_RUNTIME_CARRY_KEYS = (
+    "first_packet",
+    "pkt_count",
+    "byte_count",
+    "stats_ts",
+    "last_packet_ts",
+    "ddp_auto",
+)
+_DDP_HDR = struct.Struct(">BBBBIH")
+_DDP_LEN = struct.Struct(">H")
+_ZERO_VIEW = memoryview(bytes(4096))
+_MODE_ALIASES = {
+    "2": "group",
+    "g": "group",
+    "group": "group",
+    "groupe": "group",
+    "3": "fusion",
+    "f": "fusion",
+    "fusion": "fusion",
+    "1": "unique",
+    "u": "unique",
+    "unique": "unique",
+}
+_PROTO_ALIASES = {"udp": "wled", "drgb": "wled", "wled": "wled"}
+_RELEASE_CACHE_PATH = pathlib.Path(os.path.expanduser("~/.cache/ledfx_icue/release.json"))
+_RELEASE_CACHE_MAX_AGE = 3600.0
+_RELEASE_MAX_BYTES = 1024 * 1024
+
+def _json_loads(raw):
+    if raw[:3] == b"\xef\xbb\xbf":
+        raw = raw[3:]
+    if _HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 def load_config(path):
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    with open(path, "rb") as f:
+        data = _json_loads(f.read())
     if not isinstance(data, dict):
         raise RuntimeError("config.json invalide: objet JSON attendu.")
     return data
 
 
+@functools.lru_cache(maxsize=1)
+def _exe_dir():
+    try:
+        return pathlib.Path(sys.executable).resolve().parent
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _meipass_dir():
+    meipass = getattr(sys, "_MEIPASS", None)
+    if not meipass:
+        return None
+    try:
+        return pathlib.Path(meipass)
+    except Exception:
+        return None
+
+
 def _resolve_config_path(path):
     p = pathlib.Path(path)
     if p.is_absolute():
         return p
-    if getattr(sys, "frozen", False):
-        return pathlib.Path(sys.executable).resolve().parent / p
+    exe_dir = _exe_dir()
+    if getattr(sys, "frozen", False) and exe_dir is not None:
+        return exe_dir / p
     candidates = [pathlib.Path.cwd() / p]
-    try:
-        candidates.append(pathlib.Path(sys.executable).resolve().parent / p)
-    except Exception:
-        pass
-    meipass = getattr(sys, "_MEIPASS", None)
-    if meipass:
-        try:
-            candidates.append(pathlib.Path(meipass) / p)
-        except Exception:
-            pass
+    if exe_dir is not None:
+        candidates.append(exe_dir / p)
+    meipass_dir = _meipass_dir()
+    if meipass_dir is not None:
+        candidates.append(meipass_dir / p)
     for candidate in candidates:
         if candidate.exists():
             return candidate
@@ -68,25 +143,42 @@ def _resolve_config_path(path):
 def _version_key(value):
     if value is None:
         return None
-    s = str(value).strip()
+    return _version_key_str(str(value))
+
+
+@functools.lru_cache(maxsize=256)
+def _version_key_str(value):
+    s = value.strip()
     if not s:
         return None
     if s[0] in ("v", "V"):
         s = s[1:]
     parts = []
-    for part in re.split(r"[\\._\\-+]", s):
+    for part in _VERSION_SPLIT_RE.split(s):
         if not part:
             continue
         if part.isdigit():
             parts.append(int(part))
             continue
-        m = re.match(r"(\\d+)", part)
+        m = _LEADING_DIGITS_RE.match(part)
         if m:
             parts.append(int(m.group(1)))
     return tuple(parts) if parts else None
 
 
 def _is_newer_version(latest, current):
+    if latest == current:
+        return False
+    return _is_newer_version_str(
+        None if latest is None else str(latest),
+        None if current is None else str(current),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _is_newer_version_str(latest, current):
+    if latest == current:
+        return False
     latest_key = _version_key(latest)
     current_key = _version_key(current)
     if latest_key is None or current_key is None:
@@ -94,13 +186,78 @@ def _is_newer_version(latest, current):
     return latest_key > current_key
 
 
-def _fetch_latest_release(repo, timeout=6):
+def _load_release_cache():
+    try:
+        with open(_RELEASE_CACHE_PATH, "rb") as f:
+            data = _json_loads(f.read())
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_release_cache(cache):
+    try:
+        _RELEASE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _RELEASE_CACHE_PATH.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, _RELEASE_CACHE_PATH)
+    except Exception:
+        pass
+
+
+def _read_with_deadline(resp, limit, deadline):
+    # Le timeout socket ne borne qu'un recv: on borne aussi la lecture totale
+    chunks = []
+    remaining = limit
+    while remaining > 0:
+        if time.monotonic() > deadline:
+            raise TimeoutError("Lecture release trop longue")
+        chunk = resp.read(min(16384, remaining))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _fetch_latest_release(repo, timeout=6, max_age=_RELEASE_CACHE_MAX_AGE):
     url = f"https://api.github.com/repos/{repo}/releases/latest"
+    cache = _load_release_cache()
+    cached = cache.get(repo)
+    if not isinstance(cached, dict) or not isinstance(cached.get("payload"), dict):
+        cached = None
+    if cached:
+        try:
+            age = time.time() - float(cached.get("fetched_at") or 0)
+        except (TypeError, ValueError):
+            age = max_age
+        # Resultat recent: pas besoin de toucher au reseau
+        if 0 <= age < max_age:
+            return cached["payload"]
     req = urllib.request.Request(
         url, headers={"User-Agent": "ledfx-icue-bridge"}
     )
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        data = json.loads(resp.read().decode("utf-8", errors="replace"))
+    if cached:
+        if cached.get("etag"):
+            req.add_header("If-None-Match", cached["etag"])
+        if cached.get("last_modified"):
+            req.add_header("If-Modified-Since", cached["last_modified"])
+    deadline = time.monotonic() + timeout
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            data = _json_loads(
+                _read_with_deadline(resp, _RELEASE_MAX_BYTES, deadline)
+            )
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+    except urllib.error.HTTPError as exc:
+        # 304: release inchangee, on reutilise le cache
+        if exc.code == 304 and cached:
+            cached["fetched_at"] = time.time()
+            _save_release_cache(cache)
+            return cached["payload"]
+        raise
     tag = data.get("tag_name") or ""
     html_url = data.get("html_url") or url
     download_url = None
@@ -111,7 +268,15 @@ def _fetch_latest_release(repo, timeout=6):
             break
     if not download_url:
         download_url = html_url
-    return {"version": tag, "url": download_url}
+    info = {"version": tag, "url": download_url}
+    cache[repo] = {
+        "etag": etag,
+        "last_modified": last_modified,
+        "payload": info,
+        "fetched_at": time.time(),
+    }
+    _save_release_cache(cache)
+    return info
 
 # fdgdfgf
 def setup_logging(cfg):
@@ -138,34 +303,45 @@ def setup_logging(cfg):
 
 
 def build_lut(brightness, gamma):
-    lut = [0] * 256
-    for i in range(256):
-        v = i / 255.0
-        if gamma != 1.0:
-            v = v ** gamma
-        v = v * 255.0 * brightness
-        if v < 0:
-            v = 0
-        if v > 255:
-            v = 255
-        lut[i] = int(v + 0.5)
-    return lut
+    brightness = float(brightness)
+    gamma = float(gamma)
+    if gamma != 1.0:
+        values = [((i / 255.0) ** gamma) * 255.0 * brightness for i in range(256)]
+    else:
+        values = [(i / 255.0) * 255.0 * brightness for i in range(256)]
+    return [0 if v < 0 else 255 if v > 255 else int(v + 0.5) for v in values]
+
+
+_IDENTITY_LUT = bytes(range(256))
+
+
+def build_lut_bytes(brightness, gamma):
+    lut = bytes(build_lut(brightness, gamma))
+    # Objet partage si neutre: apply_frame_map saute alors le translate
+    return _IDENTITY_LUT if lut == _IDENTITY_LUT else lut
+
+
+@functools.lru_cache(maxsize=16)
+def _white_balance_tables(wb):
+    # Une table 256 entrees par canal: gain + clamp precalcules
+    return tuple(
+        bytes(int(max(0, min(255, v * gain))) for v in range(256)) for gain in wb
+    )
 
 
 def parse_rgb(value):
     if value is None:
         return None
     if isinstance(value, (list, tuple)) and len(value) == 3:
-        return tuple(_clamp_byte(int(v)) for v in value)
+        return tuple(0 if v < 0 else 255 if v > 255 else v for v in map(int, value))
     s = str(value).strip()
     if not s:
         return None
-    s = s.replace(";", ",").replace(" ", "")
-    parts = s.split(",")
+    parts = s.translate(_RGB_TRANSLATE).split(",")
     if len(parts) != 3:
         return None
     try:
-        return tuple(_clamp_byte(int(p)) for p in parts)
+        return tuple(0 if v < 0 else 255 if v > 255 else v for v in map(int, parts))
     except Exception:
         return None
 
@@ -198,14 +374,6 @@ def parse_white_balance(value):
     return (r, g, b)
 
 
-def _clamp_byte(v):
-    if v < 0:
-        return 0
-    if v > 255:
-        return 255
-    return v
-
-
 def _get_attr(obj, names):
     for name in names:
         if obj is None:
@@ -221,14 +389,17 @@ def parse_int_list(value):
     if isinstance(value, (list, tuple, set)):
         raw = []
         for v in value:
-            raw.extend(str(v).replace(";", ",").split(","))
+            raw.extend(str(v).translate(_LIST_SEP_TRANSLATE).split(","))
     else:
-        raw = str(value).replace(";", ",").split(",")
+        raw = str(value).translate(_LIST_SEP_TRANSLATE).split(",")
     out = []
     for part in raw:
         p = part.strip()
         if not p:
             continue
+        if p.isdecimal() or (p[0] == "-" and p[1:].isdecimal()):
+            out.append(int(p))
+            continue
         try:
             out.append(int(p))
         except Exception:
@@ -238,9 +409,7 @@ def parse_int_list(value):
 
 def normalize_protocol(value, fallback="drgb"):
     proto = (value or fallback or "drgb").lower()
-    if proto in ("udp", "drgb", "wled"):
-        return "wled"
-    return proto
+    return _PROTO_ALIASES.get(proto, proto)
 
 
 def _normalize_list(value):
@@ -253,44 +422,55 @@ def _normalize_list(value):
     return [str(value)]
 
 
+def _contains_patterns(value):
+    return tuple(p.lower() for p in _normalize_list(value))
+
+
 def _match_contains(text, patterns):
+    # patterns deja en minuscules (voir _contains_patterns)
     if not patterns:
         return True
     if text is None:
         return False
     t = str(text).lower()
     for p in patterns:
-        if p is None:
-            continue
-        if str(p).lower() in t:
+        if p in t:
             return True
     return False
 
 
-def _device_sort_key(dev, sort_key):
+def _make_device_sort_key(sort_key):
     if sort_key == "x":
-        return (dev.get("center_x") is None, dev.get("center_x", 0.0))
+        return lambda dev: (dev.get("center_x") is None, dev.get("center_x", 0.0))
     if sort_key == "y":
-        return (dev.get("center_y") is None, dev.get("center_y", 0.0))
+        return lambda dev: (dev.get("center_y") is None, dev.get("center_y", 0.0))
     if sort_key == "xy":
-        return (
+        return lambda dev: (
             dev.get("center_x") is None,
             dev.get("center_x", 0.0),
             dev.get("center_y", 0.0),
         )
     if sort_key == "yx":
-        return (
+        return lambda dev: (
             dev.get("center_y") is None,
             dev.get("center_y", 0.0),
             dev.get("center_x", 0.0),
         )
     if sort_key == "model":
-        return str(dev.get("model") or "")
-    return str(dev.get("device_id_str") or dev.get("device_id") or "")
+        return lambda dev: str(dev.get("model") or "")
+    return lambda dev: str(dev.get("device_id_str") or dev.get("device_id") or "")
 
 
-def _angle_order(points, start, direction):
+def _angle_order(points, start, direction, center=None):
     import math
+    if not points:
+        return []
+    if center is None:
+        _, xs, ys = zip(*points)
+        cx = sum(xs) / len(points)
+        cy = sum(ys) / len(points)
+    else:
+        cx, cy = center
     start = (start or "top").lower()
     direction = (direction or "clockwise").lower()
     start_angle = {
@@ -299,23 +479,53 @@ def _angle_order(points, start, direction):
         "left": math.pi,
         "bottom": -math.pi / 2.0,
     }.get(start, math.pi / 2.0)
-    order = []
-    for idx, x, y, cx, cy in points:
-        angle = math.atan2(y - cy, x - cx)
-        if direction == "clockwise":
-            delta = (start_angle - angle) % (2 * math.pi)
-        else:
-            delta = (angle - start_angle) % (2 * math.pi)
-        order.append((delta, idx))
-    order.sort(key=lambda t: t[0])
-    return [idx for _, idx in order]
+    atan2 = math.atan2
+    two_pi = 2 * math.pi
+    if direction == "clockwise":
+        deltas = [(start_angle - atan2(y - cy, x - cx)) % two_pi for _, x, y in points]
+    else:
+        deltas = [(atan2(y - cy, x - cx) - start_angle) % two_pi for _, x, y in points]
+    ranked = sorted(range(len(deltas)), key=deltas.__getitem__)
+    return [points[i][0] for i in ranked]
+
+
+def _kmeans_assign(px, py, centers):
+    k = len(centers)
+    if k == 2:
+        # Cas le plus courant (2 ventilos / anneau double): comparaison directe
+        (ax, ay), (bx, by) = centers
+        return [
+            0 if (x - ax) ** 2 + (y - ay) ** 2 <= (x - bx) ** 2 + (y - by) ** 2 else 1
+            for x, y in zip(px, py)
+        ]
+    cxs = [c[0] for c in centers]
+    cys = [c[1] for c in centers]
+    labels = []
+    for x, y in zip(px, py):
+        best = None
+        best_j = 0
+        for j in range(k):
+            d = (x - cxs[j]) ** 2 + (y - cys[j]) ** 2
+            if best is None or d < best:
+                best = d
+                best_j = j
+        labels.append(best_j)
+    return labels
 
 
 def _kmeans_2d(points, k, max_iter=20):
     if not points or k <= 1:
         return [points]
-    xs = sorted(p[1] for p in points)
-    ys = sorted(p[2] for p in points)
+    # Positions statiques: meme entree -> meme partition (reconnexions, rebuilds)
+    return [list(c) for c in _kmeans_2d_cached(tuple(points), k, max_iter)]
+
+
+@functools.lru_cache(maxsize=64)
+def _kmeans_2d_cached(points, k, max_iter):
+    px = [p[1] for p in points]
+    py = [p[2] for p in points]
+    xs = sorted(px)
+    ys = sorted(py)
     centers = []
     for i in range(k):
         q = i / (k - 1) if k > 1 else 0
@@ -323,18 +533,18 @@ def _kmeans_2d(points, k, max_iter=20):
         yi = ys[int(q * (len(ys) - 1))]
         centers.append((xi, yi))
     for _ in range(max_iter):
-        clusters = [[] for _ in range(k)]
-        for p in points:
-            best = min(range(k), key=lambda j: (p[1] - centers[j][0]) ** 2 + (p[2] - centers[j][1]) ** 2)
-            clusters[best].append(p)
-        new_centers = []
-        for i, c in enumerate(clusters):
-            if c:
-                mx = sum(p[1] for p in c) / len(c)
-                my = sum(p[2] for p in c) / len(c)
-                new_centers.append((mx, my))
-            else:
-                new_centers.append(centers[i])
+        labels = _kmeans_assign(px, py, centers)
+        sum_x = [0.0] * k
+        sum_y = [0.0] * k
+        counts = [0] * k
+        for label, x, y in zip(labels, px, py):
+            sum_x[label] += x
+            sum_y[label] += y
+            counts[label] += 1
+        new_centers = [
+            (sum_x[i] / counts[i], sum_y[i] / counts[i]) if counts[i] else centers[i]
+            for i in range(k)
+        ]
         shift = max(
             (new_centers[i][0] - centers[i][0]) ** 2 + (new_centers[i][1] - centers[i][1]) ** 2
             for i in range(k)
@@ -343,10 +553,9 @@ def _kmeans_2d(points, k, max_iter=20):
         if shift < 1e-4:
             break
     clusters = [[] for _ in range(k)]
-    for p in points:
-        best = min(range(k), key=lambda j: (p[1] - centers[j][0]) ** 2 + (p[2] - centers[j][1]) ** 2)
-        clusters[best].append(p)
-    return clusters
+    for label, p in zip(_kmeans_assign(px, py, centers), points):
+        clusters[label].append(p)
+    return tuple(tuple(c) for c in clusters)
 
 
 def _cluster_sort_key(center, sort_key):
@@ -369,14 +578,19 @@ def _normalize_group_order(order, count):
         return None
     if not order_list:
         return None
-    if all(i >= 1 for i in order_list):
-        order_list = [i - 1 for i in order_list]
-    order_list = [i for i in order_list if 0 <= i < count]
-    if not order_list:
+    shift = 1 if min(order_list) >= 1 else 0
+    seen = set()
+    out = []
+    for i in order_list:
+        i -= shift
+        if 0 <= i < count and i not in seen:
+            seen.add(i)
+            out.append(i)
+    if not out:
         return None
-    if len(order_list) < count:
-        order_list += [i for i in range(count) if i not in order_list]
-    return order_list
+    if len(out) < count:
+        out += [i for i in range(count) if i not in seen]
+    return out
 
 
 def _ring_order(points, outer_leds, inner_leds, start, direction, inner_first, order_mode):
@@ -403,16 +617,31 @@ def _ring_order(points, outer_leds, inner_leds, start, direction, inner_first, o
     outer = by_dist[: int(outer_leds)] if outer_leds else []
     inner = by_dist[int(outer_leds) : int(outer_leds) + int(inner_leds)] if inner_leds else []
 
-    outer_pts = [(idx, x, y, cx, cy) for _, idx, x, y in outer]
-    inner_pts = [(idx, x, y, cx, cy) for _, idx, x, y in inner]
-    outer_order = _angle_order(outer_pts, start, direction)
-    inner_order = _angle_order(inner_pts, start, direction)
+    outer_pts = [(idx, x, y) for _, idx, x, y in outer]
+    inner_pts = [(idx, x, y) for _, idx, x, y in inner]
+    outer_order = _angle_order(outer_pts, start, direction, (cx, cy))
+    inner_order = _angle_order(inner_pts, start, direction, (cx, cy))
 
     if inner_first:
         return inner_order + outer_order
     return outer_order + inner_order
 
 
+def _transform_points(positions, flip_x=False, flip_y=False, swap_xy=False):
+    points = []
+    for idx, pos in enumerate(positions):
+        x = pos.get("x")
+        y = pos.get("y")
+        if x is None or y is None:
+            return None
+        fx = -float(x) if flip_x else float(x)
+        fy = -float(y) if flip_y else float(y)
+        if swap_xy:
+            fx, fy = fy, fx
+        points.append((idx, fx, fy))
+    return points
+
+
 def _build_aio_cluster_orders(
     positions,
     cluster_count=3,
@@ -427,17 +656,7 @@ def _build_aio_cluster_orders(
 ):
     if not positions:
         return None
-    points = []
-    for idx, pos in enumerate(positions):
-        x = pos.get("x")
-        y = pos.get("y")
-        if x is None or y is None:
-            return None
-        fx = -float(x) if flip_x else float(x)
-        fy = -float(y) if flip_y else float(y)
-        if swap_xy:
-            fx, fy = fy, fx
-        points.append((idx, fx, fy))
+    points = _transform_points(positions, flip_x, flip_y, swap_xy)
     if not points:
         return None
     try:
@@ -473,9 +692,7 @@ def _build_aio_cluster_orders(
 
     orders = []
     for c, center in cluster_info:
-        cx, cy = center
-        pts = [(idx, x, y, cx, cy) for idx, x, y in c]
-        order = _angle_order(pts, start, direction)
+        order = _angle_order(c, start, direction, center)
         if not order:
             order = [p[0] for p in c]
         orders.append(order)
@@ -531,14 +748,7 @@ def _build_pump_lr_pairs(
 
 
 def _normalize_mode(value):
-    v = str(value or "").strip().lower()
-    if v in ("2", "g", "group", "groupe"):
-        return "group"
-    if v in ("3", "f", "fusion"):
-        return "fusion"
-    if v in ("1", "u", "unique"):
-        return "unique"
-    return None
+    return _MODE_ALIASES.get(str(value or "").strip().lower())
 
 
 def _normalize_name(value):
@@ -833,6 +1043,14 @@ class CueSdkWrapper:
         self.CorsairLedColor = CorsairLedColor
         self.CorsairError = CorsairError
         self.CorsairSessionState = CorsairSessionState
+        # Constantes resolues une fois (polls, watchdog, request_control)
+        self.CE_Success = CorsairError.CE_Success
+        self.CSS_Connected = getattr(CorsairSessionState, "CSS_Connected", None)
+        self._control_level = getattr(
+            CorsairAccessLevel, "CAL_ExclusiveLightingControl", None
+        )
+        if self._control_level is None:
+            self._control_level = getattr(CorsairAccessLevel, "CAL_Shared", None)
 
     def _call(self, names, *args):
         for name in names:
@@ -850,11 +1068,7 @@ class CueSdkWrapper:
             return self._call(("connect",))
 
     def request_control(self):
-        level = None
-        if hasattr(self.CorsairAccessLevel, "CAL_ExclusiveLightingControl"):
-            level = self.CorsairAccessLevel.CAL_ExclusiveLightingControl
-        elif hasattr(self.CorsairAccessLevel, "CAL_Shared"):
-            level = self.CorsairAccessLevel.CAL_Shared
+        level = self._control_level
         if level is None:
             return None
         try:
@@ -919,11 +1133,18 @@ class LedMapper:
         self.global_map = []
         self.total_leds = 0
         self.mutable_colors = True
+        self._frame_plans = {}
+        self._frame_targets = {}
+        self._device_ids = ()
+        self._color_factory = None
+        self._direct_only = set()
+        self._flush_pending = False
+        self._points_cache = {}
         self.devices = []
         self.device_types_include = set()
         self.device_types_exclude = set()
         try:
-            self._success_code = int(self.sdk.CorsairError.CE_Success)
+            self._success_code = int(self.sdk.CE_Success)
         except Exception:
             self._success_code = 0
         self.debug_icue = False
@@ -973,31 +1194,30 @@ class LedMapper:
             return None, None
         return x, y
 
+    def _device_points(self, device_id, flip_x=False, flip_y=False, swap_xy=False):
+        key = (device_id, bool(flip_x), bool(flip_y), bool(swap_xy))
+        if key in self._points_cache:
+            return self._points_cache[key]
+        positions = self.positions_by_device.get(device_id)
+        points = None
+        if positions:
+            points = _transform_points(positions, flip_x, flip_y, swap_xy)
+            if points is not None:
+                points = tuple(points)
+        self._points_cache[key] = points
+        return points
+
     def _compute_serpentine_order(
         self,
-        positions,
+        points,
         row_tolerance,
         first_dir,
         row_order,
         rows_count,
-        flip_x,
-        flip_y,
-        swap_xy,
         mode,
     ):
-        if not positions:
+        if not points:
             return None
-        points = []
-        for idx, pos in enumerate(positions):
-            x = pos.get("x")
-            y = pos.get("y")
-            if x is None or y is None:
-                return None
-            fx = -float(x) if flip_x else float(x)
-            fy = -float(y) if flip_y else float(y)
-            if swap_xy:
-                fx, fy = fy, fx
-            points.append((idx, fx, fy))
         rows = []
         if rows_count is not None:
             try:
@@ -1023,9 +1243,9 @@ class LedMapper:
 
             row_order_val = (row_order or "top").lower()
             if row_order_val == "bottom":
-                points.sort(key=lambda p: (-p[2], p[1]))
+                points = sorted(points, key=lambda p: (-p[2], p[1]))
             else:
-                points.sort(key=lambda p: (p[2], p[1]))
+                points = sorted(points, key=lambda p: (p[2], p[1]))
             current = []
             current_y = None
             for p in points:
@@ -1044,17 +1264,16 @@ class LedMapper:
 
         first_dir = (first_dir or "left").lower()
         mode = (mode or "serpentine").lower()
+        if mode == "linear":
+            reverses = [first_dir == "right"] * len(rows)
+        else:
+            # Serpentin: une rangee sur deux inversee, la premiere selon first_dir
+            first_reversed = first_dir == "right"
+            reverses = [(i % 2 == 0) == first_reversed for i in range(len(rows))]
+        x_key = operator.itemgetter(1)
         order = []
-        for idx_row, row in enumerate(rows):
-            if mode == "linear":
-                reverse = first_dir == "right"
-            else:
-                if first_dir == "right":
-                    reverse = (idx_row % 2 == 0)
-                else:
-                    reverse = (idx_row % 2 == 1)
-            row_sorted = sorted(row, key=lambda p: p[1], reverse=reverse)
-            order.extend([p[0] for p in row_sorted])
+        for row, reverse in zip(rows, reverses):
+            order.extend([p[0] for p in sorted(row, key=x_key, reverse=reverse)])
         return order
 
     def apply_serpentine(
@@ -1076,16 +1295,12 @@ class LedMapper:
             if dev_type not in device_types:
                 continue
             device_id = dev["device_id"]
-            positions = self.positions_by_device.get(device_id)
             order = self._compute_serpentine_order(
-                positions,
+                self._device_points(device_id, flip_x, flip_y, swap_xy),
                 row_tolerance,
                 first_dir,
                 row_order,
                 rows_count,
-                flip_x,
-                flip_y,
-                swap_xy,
                 mode,
             )
             if order:
@@ -1121,28 +1336,10 @@ class LedMapper:
             if dev_type not in device_types:
                 continue
             device_id = dev["device_id"]
-            positions = self.positions_by_device.get(device_id)
-            if not positions:
-                continue
-            pts = []
-            for idx, pos in enumerate(positions):
-                x = pos.get("x")
-                y = pos.get("y")
-                if x is None or y is None:
-                    pts = []
-                    break
-                fx = -float(x) if flip_x else float(x)
-                fy = -float(y) if flip_y else float(y)
-                if swap_xy:
-                    fx, fy = fy, fx
-                pts.append((idx, fx, fy))
+            pts = self._device_points(device_id, flip_x, flip_y, swap_xy)
             if not pts:
                 continue
-            cx = sum(p[1] for p in pts) / len(pts)
-            cy = sum(p[2] for p in pts) / len(pts)
-            order = _angle_order(
-                [(idx, x, y, cx, cy) for idx, x, y in pts], start, direction
-            )
+            order = _angle_order(pts, start, direction)
             if order:
                 self.order_by_device[device_id] = order
 
@@ -1155,17 +1352,7 @@ class LedMapper:
             if dev_type not in device_types:
                 continue
             device_id = dev["device_id"]
-            positions = self.positions_by_device.get(device_id)
-            if not positions:
-                continue
-            pts = []
-            for idx, pos in enumerate(positions):
-                x = pos.get("x")
-                y = pos.get("y")
-                if x is None or y is None:
-                    pts = []
-                    break
-                pts.append((idx, float(x), float(y)))
+            pts = self._device_points(device_id)
             if not pts:
                 continue
             xs = [p[1] for p in pts]
@@ -1176,9 +1363,9 @@ class LedMapper:
             if chosen == "auto":
                 chosen = "x" if rx >= ry else "y"
             if chosen == "y":
-                pts.sort(key=lambda p: (p[2], p[1]))
+                pts = sorted(pts, key=lambda p: (p[2], p[1]))
             else:
-                pts.sort(key=lambda p: (p[1], p[2]))
+                pts = sorted(pts, key=lambda p: (p[1], p[2]))
             order = [p[0] for p in pts]
             if order:
                 self.order_by_device[device_id] = order
@@ -1232,10 +1419,12 @@ class LedMapper:
             if dev_type not in device_types:
                 continue
             device_id = dev["device_id"]
-            colors = self.led_colors_by_device.get(device_id) or []
-            order = self.order_by_device.get(device_id) or list(range(len(colors)))
-            order = list(reversed(order))
-            self.order_by_device[device_id] = order
+            order = self.order_by_device.get(device_id)
+            if order:
+                self.order_by_device[device_id] = order[::-1]
+            else:
+                count = len(self.led_colors_by_device.get(device_id) or [])
+                self.order_by_device[device_id] = list(range(count - 1, -1, -1))
 
     def apply_fan_ring(
         self,
@@ -1279,18 +1468,7 @@ class LedMapper:
             k = max(1, int(k))
 
             # Prepare points with normalized coords
-            points = []
-            for idx, pos in enumerate(positions):
-                x = pos.get("x")
-                y = pos.get("y")
-                if x is None or y is None:
-                    points = []
-                    break
-                nx = -float(x) if flip_x else float(x)
-                ny = -float(y) if flip_y else float(y)
-                if swap_xy:
-                    nx, ny = ny, nx
-                points.append((idx, nx, ny))
+            points = self._device_points(device_id, flip_x, flip_y, swap_xy) or []
 
             layout = (layout or "sequential").lower()
             if layout == "auto":
@@ -1384,26 +1562,39 @@ class LedMapper:
             q = i / (rows_count - 1) if rows_count > 1 else 0
             idx = int(q * (len(ys_sorted) - 1))
             centers.append(ys_sorted[idx])
+        labels = []
         for _ in range(20):
-            clusters = [[] for _ in range(rows_count)]
-            for p in points:
-                ci = min(range(rows_count), key=lambda j: abs(p[2] - centers[j]))
-                clusters[ci].append(p)
-            new_centers = []
-            for i, c in enumerate(clusters):
-                if c:
-                    new_centers.append(sum(p[2] for p in c) / len(c))
-                else:
-                    new_centers.append(centers[i])
+            labels = []
+            for y in ys:
+                best_j = 0
+                best_d = abs(y - centers[0])
+                for j in range(1, rows_count):
+                    d = abs(y - centers[j])
+                    if d < best_d:
+                        best_d = d
+                        best_j = j
+                labels.append(best_j)
+            sums = [0.0] * rows_count
+            counts = [0] * rows_count
+            for label, y in zip(labels, ys):
+                sums[label] += y
+                counts[label] += 1
+            new_centers = [
+                sums[i] / counts[i] if counts[i] else centers[i]
+                for i in range(rows_count)
+            ]
             delta = max(abs(new_centers[i] - centers[i]) for i in range(rows_count))
             centers = new_centers
             if delta < 1e-3:
                 break
-        rows = [c for _, c in sorted(zip(centers, clusters), key=lambda t: t[0])]
-        return rows
+        clusters = [[] for _ in range(rows_count)]
+        for label, p in zip(labels, points):
+            clusters[label].append(p)
+        ranked = sorted(range(rows_count), key=centers.__getitem__)
+        return [clusters[i] for i in ranked]
     def enumerate(self, clear_on_start):
         devices, err = self.sdk.get_devices(self.device_type_mask)
-        if err != self.sdk.CorsairError.CE_Success:
+        if err != self.sdk.CE_Success:
             raise RuntimeError(f"get_devices erreur: {err}")
 
         for dev in devices:
@@ -1411,7 +1602,7 @@ class LedMapper:
             if device_id is None:
                 continue
             positions, perr = self.sdk.get_led_positions(device_id)
-            if perr != self.sdk.CorsairError.CE_Success or not positions:
+            if perr != self.sdk.CE_Success or not positions:
                 continue
             info = None
             try:
@@ -1425,27 +1616,28 @@ class LedMapper:
                 continue
             if self.device_types_exclude and dev_type in self.device_types_exclude:
                 continue
-            colors = []
-            positions_list = []
-            for pos in positions:
-                led_id = self._get_led_id(pos)
-                if led_id is None:
-                    continue
-                x, y = self._get_led_xy(pos)
-                positions_list.append({"id": led_id, "x": x, "y": y})
-                color = self._make_color(led_id, 0, 0, 0)
-                colors.append(color)
-            if not colors:
+            get_id = self._get_led_id
+            get_xy = self._get_led_xy
+            positions_list = [
+                {"id": led_id, "x": xy[0], "y": xy[1]}
+                for led_id, xy in (
+                    (get_id(pos), get_xy(pos)) for pos in positions
+                )
+                if led_id is not None
+            ]
+            if not positions_list:
                 continue
+            make_color = self._make_color
+            colors = [make_color(p["id"], 0, 0, 0) for p in positions_list]
             self.led_colors_by_device[device_id] = colors
             self.positions_by_device[device_id] = positions_list
-            for idx in range(len(colors)):
-                self.global_map.append((device_id, idx))
+            self.global_map += [(device_id, idx, None, None) for idx in range(len(colors))]
             stats = self._compute_device_stats(positions_list)
             self.devices.append(
                 {
                     "device_id": device_id,
                     "device_id_str": str(device_id),
+                    "device_id_lc": str(device_id).lower(),
                     "info": info,
                     "device_type": dev_type,
                     "leds": len(colors),
@@ -1463,6 +1655,8 @@ class LedMapper:
         self.total_leds = len(self.global_map)
         if self.total_leds == 0:
             raise RuntimeError("Aucun LED detecte via iCUE.")
+        self._device_ids = tuple(self.led_colors_by_device)
+        self._direct_only.clear()
 
         if clear_on_start:
             self.apply_frame(bytearray(self.total_leds * 3))
@@ -1470,31 +1664,44 @@ class LedMapper:
     def apply_frame(self, frame_bytes, lut=None):
         return self.apply_frame_map(
             self.global_map,
-            list(self.led_colors_by_device.keys()),
+            self._device_ids,
             frame_bytes,
             lut=lut,
             update_mode="auto",
         )
 
-    def _device_base_index(self, device_id):
-        base = 0
-        for did, colors in self.led_colors_by_device.items():
-            if did == device_id:
-                return base
-            base += len(colors)
-        return base
-
-    def _make_color(self, led_id, r, g, b):
+    def _probe_color_factory(self, led_id):
+        # Signature de CorsairLedColor detectee une seule fois
+        ctor = self.sdk.CorsairLedColor
         try:
-            return self.sdk.CorsairLedColor(led_id, r, g, b, 255)
+            ctor(led_id, 0, 0, 0, 255)
         except Exception:
-            try:
-                c = self.sdk.CorsairLedColor(led_id, r, g, b)
-                if hasattr(c, "a"):
-                    c.a = 255
-                return c
-            except Exception:
+            pass
+        else:
+            def make_rgba(led_id, r, g, b):
+                return ctor(led_id, r, g, b, 255)
+            return make_rgba
+        try:
+            sample = ctor(led_id, 0, 0, 0)
+        except Exception:
+            return None
+        if not hasattr(sample, "a"):
+            return ctor
+
+        def make_rgb(led_id, r, g, b):
+            c = ctor(led_id, r, g, b)
+            c.a = 255
+            return c
+        return make_rgb
+
+    def _make_color(self, led_id, r, g, b):
+        factory = self._color_factory
+        if factory is None:
+            factory = self._probe_color_factory(led_id)
+            if factory is None:
                 return self.sdk.CorsairLedColor(led_id, r, g, b, 255)
+            self._color_factory = factory
+        return factory(led_id, r, g, b)
 
     def _compute_device_stats(self, positions_list):
         xs = [p["x"] for p in positions_list if p.get("x") is not None]
@@ -1517,97 +1724,154 @@ class LedMapper:
             return order
         return list(range(len(colors)))
 
+    def _compile_frame_plan(self, map_list):
+        # Forme de map_list decodee une fois: cibles (device, led) a plat,
+        # balance des blancs et un itemgetter qui extrait tous les canaux
+        # RGB de la trame en un seul appel C
+        offsets = []
+        slots = []
+        wbs = []
+        idx = 0
+        for device_id, led_idx, src_index, wb in map_list:
+            if src_index is None:
+                offset = idx
+                idx += 3
+            else:
+                offset = int(src_index) * 3
+            if isinstance(led_idx, (list, tuple)):
+                for li in led_idx:
+                    offsets.append(offset)
+                    slots.append((device_id, li))
+                    wbs.append(wb)
+            else:
+                offsets.append(offset)
+                slots.append((device_id, led_idx))
+                wbs.append(wb)
+        channels = []
+        for offset in offsets:
+            channels += (offset, offset + 1, offset + 2)
+        getter = operator.itemgetter(*channels) if channels else None
+        need = max(offsets) + 3 if offsets else 0
+        if any(wbs):
+            wbs = [_white_balance_tables(tuple(wb)) if wb else None for wb in wbs]
+        else:
+            wbs = None
+        return slots, getter, wbs, need
+
+    def _get_frame_plan(self, map_list):
+        cached = self._frame_plans.get(id(map_list))
+        if cached is not None and cached[0] is map_list:
+            return cached[1]
+        plan = self._compile_frame_plan(map_list)
+        if len(self._frame_plans) >= 32:
+            self._frame_plans.clear()
+            self._frame_targets.clear()
+        self._frame_plans[id(map_list)] = (map_list, plan)
+        return plan
+
+    def _get_frame_targets(self, map_list, slots):
+        targets = self._frame_targets.get(id(map_list))
+        if targets is None:
+            colors_by_device = self.led_colors_by_device
+            targets = [colors_by_device[did][li] for did, li in slots]
+            # Alpha fixe a 255 une fois ici plutot qu'a chaque trame
+            if targets and hasattr(targets[0], "a"):
+                for color in targets:
+                    color.a = 255
+            self._frame_targets[id(map_list)] = targets
+        return targets
+
+    def prepare_maps(self, groups, lut=None):
+        # Compile plans et cibles au setup pour que la premiere trame
+        # de chaque groupe ne paie pas le decodage de la map; chaque groupe
+        # recoit aussi son apply_frame_map pre-lie (map, devices, lut, mode)
+        for g in groups:
+            map_list = g.get("map")
+            g["apply_frame"] = functools.partial(
+                self.apply_frame_map,
+                map_list,
+                g.get("device_ids") or (),
+                lut=lut,
+                update_mode=g.get("update_mode", "auto"),
+            )
+            if not map_list:
+                continue
+            try:
+                slots = self._get_frame_plan(map_list)[0]
+                if self.mutable_colors and slots:
+                    self._get_frame_targets(map_list, slots)
+            except Exception:
+                pass
+
+    def _frame_channels(self, src, getter, need):
+        if len(src) < need:
+            # LEDs hors trame (ou incompletes) -> noir
+            usable = len(src) - len(src) % 3
+            src = bytes(src[:usable]) + bytes(need - usable)
+        return iter(getter(src))
+
     def apply_frame_map(
-        self, map_list, device_ids, frame_bytes, lut=None, update_mode="auto"
+        self,
+        map_list,
+        device_ids,
+        frame_bytes,
+        lut=None,
+        update_mode="auto",
+        defer_flush=False,
+        skip_push=None,
     ):
         if not map_list:
             return False
-        if lut is None:
-            lut = list(range(256))
+        if lut is None or lut is _IDENTITY_LUT:
+            src = frame_bytes
+        else:
+            # Gamma/luminosite appliques en une passe C sur toute la trame
+            if not isinstance(lut, bytes):
+                lut = bytes(lut)
+            src = frame_bytes.translate(lut)
         any_ok = False
+        slots, getter, wbs, need = self._get_frame_plan(map_list)
 
-        if self.mutable_colors:
-            idx = 0
-            for entry in map_list:
-                wb = None
-                src_index = None
-                if len(entry) == 4:
-                    device_id, led_idx, src_index, wb = entry
-                elif len(entry) == 3:
-                    device_id, led_idx, src_index = entry
-                else:
-                    device_id, led_idx = entry
-                if src_index is None:
-                    offset = idx
-                    idx += 3
-                else:
-                    offset = int(src_index) * 3
-                if offset + 2 >= len(frame_bytes):
-                    r = g = b = 0
+        if self.mutable_colors and getter is not None:
+            try:
+                targets = self._get_frame_targets(map_list, slots)
+                channels = self._frame_channels(src, getter, need)
+                if wbs is None:
+                    for color, r, g, b in zip(targets, channels, channels, channels):
+                        color.r = r
+                        color.g = g
+                        color.b = b
                 else:
-                    r = lut[frame_bytes[offset]]
-                    g = lut[frame_bytes[offset + 1]]
-                    b = lut[frame_bytes[offset + 2]]
-                if wb:
-                    r = int(max(0, min(255, r * wb[0])))
-                    g = int(max(0, min(255, g * wb[1])))
-                    b = int(max(0, min(255, b * wb[2])))
-                try:
-                    if isinstance(led_idx, (list, tuple)):
-                        for li in led_idx:
-                            color = self.led_colors_by_device[device_id][li]
-                            color.r = r
-                            color.g = g
-                            color.b = b
-                            if hasattr(color, "a"):
-                                color.a = 255
-                    else:
-                        color = self.led_colors_by_device[device_id][led_idx]
+                    for color, wb, r, g, b in zip(
+                        targets, wbs, channels, channels, channels
+                    ):
+                        if wb:
+                            r = wb[0][r]
+                            g = wb[1][g]
+                            b = wb[2][b]
                         color.r = r
                         color.g = g
                         color.b = b
-                        if hasattr(color, "a"):
-                            color.a = 255
-                except Exception:
-                    self.mutable_colors = False
-                    break
+            except Exception:
+                self.mutable_colors = False
 
         if not self.mutable_colors:
             rebuilt_map = {}
             for device_id in device_ids:
                 colors = self.led_colors_by_device.get(device_id) or []
                 rebuilt_map[device_id] = [None] * len(colors)
-            idx = 0
-            for entry in map_list:
-                wb = None
-                src_index = None
-                if len(entry) == 4:
-                    device_id, led_idx, src_index, wb = entry
-                elif len(entry) == 3:
-                    device_id, led_idx, src_index = entry
-                else:
-                    device_id, led_idx = entry
-                if src_index is None:
-                    offset = idx
-                    idx += 3
-                else:
-                    offset = int(src_index) * 3
-                if offset + 2 >= len(frame_bytes):
-                    r = g = b = 0
-                else:
-                    r = lut[frame_bytes[offset]]
-                    g = lut[frame_bytes[offset + 1]]
-                    b = lut[frame_bytes[offset + 2]]
-                if wb:
-                    r = int(max(0, min(255, r * wb[0])))
-                    g = int(max(0, min(255, g * wb[1])))
-                    b = int(max(0, min(255, b * wb[2])))
-                colors = self.led_colors_by_device[device_id]
-                target_indices = (
-                    list(led_idx) if isinstance(led_idx, (list, tuple)) else [led_idx]
-                )
-                for li in target_indices:
-                    led_id = colors[li].id
+            if getter is not None:
+                channels = self._frame_channels(src, getter, need)
+                colors_by_device = self.led_colors_by_device
+                wb_iter = wbs if wbs is not None else itertools.repeat(None)
+                for (device_id, li), wb, r, g, b in zip(
+                    slots, wb_iter, channels, channels, channels
+                ):
+                    if wb:
+                        r = wb[0][r]
+                        g = wb[1][g]
+                        b = wb[2][b]
+                    led_id = colors_by_device[device_id][li].id
                     rebuilt_map[device_id][li] = self._make_color(led_id, r, g, b)
             for device_id, colors in rebuilt_map.items():
                 if colors:
@@ -1618,8 +1882,15 @@ class LedMapper:
                             colors[i] = existing[i]
                 if colors:
                     self.led_colors_by_device[device_id] = colors
+            self._frame_targets.clear()
 
         update_mode = (update_mode or "auto").lower()
+        if skip_push:
+            # Devices repousses par un groupe suivant du meme tour: couleurs
+            # deja a jour ici, un seul envoi SDK par device
+            device_ids = [d for d in device_ids if d not in skip_push]
+            if not device_ids:
+                return True
         if update_mode == "direct":
             for device_id in device_ids:
                 colors = self.led_colors_by_device.get(device_id)
@@ -1648,7 +1919,10 @@ class LedMapper:
                         msg = errb if errb is not None else errd
                         print(f"iCUE set_led_colors echoue pour {device_id}: {msg}")
             if used_buffer:
-                self.sdk.flush()
+                if defer_flush and update_mode == "buffer":
+                    self._flush_pending = True
+                else:
+                    self.sdk.flush()
             if update_mode == "buffer_safe":
                 for device_id in device_ids:
                     colors = self.led_colors_by_device.get(device_id)
@@ -1660,26 +1934,44 @@ class LedMapper:
                         print(f"iCUE set_led_colors echoue pour {device_id}: {errd}")
             return any_ok
 
+        # Buffer pour tout le monde puis un seul flush; direct seulement pour
+        # les devices qui ont deja refuse le buffer (mode colle par device).
         used_buffer = False
+        direct_only = self._direct_only
+        retry = []
         for device_id in device_ids:
             colors = self.led_colors_by_device.get(device_id)
             if not colors:
                 continue
-            okd, errd = self._try_set_direct(device_id, colors)
-            if okd:
-                any_ok = True
+            if device_id in direct_only:
+                retry.append((device_id, colors, None))
                 continue
             okb, errb = self._try_set_buffer(device_id, colors)
             if okb:
                 used_buffer = True
                 any_ok = True
-            elif self.debug_icue:
-                msg = errb if errb is not None else errd
-                print(f"iCUE set_led_colors echoue pour {device_id}: {msg}")
+            else:
+                direct_only.add(device_id)
+                retry.append((device_id, colors, errb))
         if used_buffer:
-            self.sdk.flush()
+            if defer_flush:
+                self._flush_pending = True
+            else:
+                self.sdk.flush()
+        for device_id, colors, errb in retry:
+            okd, errd = self._try_set_direct(device_id, colors)
+            any_ok = any_ok or okd
+            if self.debug_icue and not okd:
+                msg = errd if errd is not None else errb
+                print(f"iCUE set_led_colors echoue pour {device_id}: {msg}")
         return any_ok
 
+    def flush_pending(self):
+        # Flush groupe apres plusieurs apply_frame_map(defer_flush=True)
+        if self._flush_pending:
+            self._flush_pending = False
+            self.sdk.flush()
+
     def _err_from_result(self, result):
         if result is None:
             return None
@@ -1724,7 +2016,7 @@ def looks_like_ddp(data):
     header_len = 14 if (data[0] & 0x10) else 10
     if len(data) < header_len:
         return False
-    length = int.from_bytes(data[8:10], "big")
+    length = _DDP_LEN.unpack_from(data, 8)[0]
     if length == 0:
         return True
     payload_len = len(data) - header_len
@@ -1737,24 +2029,38 @@ def looks_like_ddp(data):
 
 
 def parse_ddp(data, frame_buffer):
-    header_len = 14 if (data[0] & 0x10) else 10
-    offset = int.from_bytes(data[4:8], "big")
-    length = int.from_bytes(data[8:10], "big")
-    payload = data[header_len:]
-    if length and length * 3 == len(payload):
-        length = len(payload)
-    if length and len(payload) > length:
-        payload = payload[:length]
-    push = (data[0] & 0x01) != 0
+    flags, _, _, _, offset, length = _DDP_HDR.unpack_from(data, 0)
+    header_len = 14 if (flags & 0x10) else 10
+    payload_len = max(0, len(data) - header_len)
+    if length and length * 3 == payload_len:
+        length = payload_len
+    if length and payload_len > length:
+        payload_len = length
     if offset < len(frame_buffer):
-        end = min(len(frame_buffer), offset + len(payload))
-        frame_buffer[offset:end] = payload[: end - offset]
-    return push
+        end = min(len(frame_buffer), offset + payload_len)
+        # memoryview: copie directe paquet -> buffer sans bytes intermediaire
+        with memoryview(data) as view:
+            frame_buffer[offset:end] = view[header_len:header_len + end - offset]
+    return (flags & 0x01) != 0
 
 
 def _clear_tail(frame_buffer, start):
-    if start < len(frame_buffer):
-        frame_buffer[start:] = b"\x00" * (len(frame_buffer) - start)
+    global _ZERO_VIEW
+    count = len(frame_buffer) - start
+    if count > 0:
+        # Source de zeros partagee: pas d'allocation par paquet
+        if count > len(_ZERO_VIEW):
+            _ZERO_VIEW = memoryview(bytes(count))
+        frame_buffer[start:] = _ZERO_VIEW[:count]
+
+
+def _copy_head(frame_buffer, data, start):
+    # Copie data[start:] en tete de trame sans slice intermediaire
+    copy_len = min(len(frame_buffer), len(data) - start)
+    with memoryview(data) as view:
+        frame_buffer[:copy_len] = view[start:start + copy_len]
+    if copy_len < len(frame_buffer):
+        _clear_tail(frame_buffer, copy_len)
 
 
 def parse_wled_or_raw(data, frame_buffer):
@@ -1763,101 +2069,73 @@ def parse_wled_or_raw(data, frame_buffer):
     proto = data[0]
     if proto in (1, 2, 3, 4) and len(data) >= 2:
         if proto == 2 and (len(data) - 1) % 3 == 0:
-            payload = data[1:]
-            copy_len = min(len(frame_buffer), len(payload))
-            frame_buffer[:copy_len] = payload[:copy_len]
-            if len(payload) < len(frame_buffer):
-                _clear_tail(frame_buffer, copy_len)
+            _copy_head(frame_buffer, data, 1)
             return
         if len(data) < 2:
             return
         if proto == 1:
-            payload = data[2:]
-            for i in range(0, len(payload), 4):
-                if i + 3 >= len(payload):
-                    break
-                idx = payload[i]
-                offset = idx * 3
-                if offset + 2 >= len(frame_buffer):
-                    continue
-                frame_buffer[offset] = payload[i + 1]
-                frame_buffer[offset + 1] = payload[i + 2]
-                frame_buffer[offset + 2] = payload[i + 3]
+            # Quadruplets (index, r, g, b) lus directement dans data
+            limit = len(frame_buffer) - 2
+            end = 2 + ((len(data) - 2) // 4) * 4
+            for i in range(2, end, 4):
+                offset = data[i] * 3
+                if offset < limit:
+                    frame_buffer[offset:offset + 3] = data[i + 1:i + 4]
             return
         if proto == 2:
-            payload = data[2:]
-            copy_len = min(len(frame_buffer), len(payload))
-            frame_buffer[:copy_len] = payload[:copy_len]
-            if len(payload) < len(frame_buffer):
-                _clear_tail(frame_buffer, copy_len)
+            _copy_head(frame_buffer, data, 2)
             return
         if proto == 3:
-            payload = data[2:]
-            out = 0
-            for i in range(0, len(payload), 4):
-                if i + 2 >= len(payload) or out + 2 >= len(frame_buffer):
-                    break
-                frame_buffer[out] = payload[i]
-                frame_buffer[out + 1] = payload[i + 1]
-                frame_buffer[out + 2] = payload[i + 2]
-                out += 3
+            # RGBW -> RGB: une affectation par canal via slices a pas
+            count = min((len(data) - 1) // 4, len(frame_buffer) // 3)
+            if count > 0:
+                stop = 2 + count * 4
+                frame_buffer[0:count * 3:3] = data[2:stop:4]
+                frame_buffer[1:count * 3:3] = data[3:stop:4]
+                frame_buffer[2:count * 3:3] = data[4:stop:4]
             return
         if proto == 4:
             if len(data) < 4:
                 return
-            start = (data[2] << 8) | data[3]
-            payload = data[4:]
-            for i in range(0, len(payload), 3):
-                idx = start + (i // 3)
-                offset = idx * 3
-                if i + 2 >= len(payload) or offset + 2 >= len(frame_buffer):
-                    break
-                frame_buffer[offset] = payload[i]
-                frame_buffer[offset + 1] = payload[i + 1]
-                frame_buffer[offset + 2] = payload[i + 2]
+            offset = ((data[2] << 8) | data[3]) * 3
+            # Pixels complets seulement, copies en une seule slice
+            count = min((len(data) - 4) // 3, (len(frame_buffer) - offset) // 3)
+            if count > 0:
+                with memoryview(data) as view:
+                    frame_buffer[offset:offset + count * 3] = view[4:4 + count * 3]
             return
 
     if len(data) % 3 == 0:
-        copy_len = min(len(frame_buffer), len(data))
-        frame_buffer[:copy_len] = data[:copy_len]
-        if len(data) < len(frame_buffer):
-            _clear_tail(frame_buffer, copy_len)
+        _copy_head(frame_buffer, data, 0)
+
+
+@functools.lru_cache(maxsize=256)
+def _device_type_value(name, sdk):
+    v = getattr(sdk.CorsairDeviceType, name, None)
+    if v is not None:
+        return int(getattr(v, "value", v))
+    try:
+        return int(name)
+    except Exception:
+        return None
+
+
+def _split_type_names(value):
+    if isinstance(value, str):
+        return [p for p in (p.strip() for p in _TYPE_SEP_RE.split(value)) if p]
+    return [p for p in (str(p).strip() for p in value) if p]
 
 
 def parse_device_types(value, sdk):
     if not value:
         return []
-    def enum_to_int(v):
-        if hasattr(v, "value"):
-            return int(v.value)
-        return int(v)
-    items = []
-    if isinstance(value, str):
-        parts = [p.strip() for p in value.replace(",", "|").split("|")]
-        items = [p for p in parts if p]
-    elif isinstance(value, (list, tuple, set)):
-        items = [str(p).strip() for p in value if str(p).strip()]
-    else:
+    if not isinstance(value, (str, list, tuple, set)):
         return []
-
-    out = []
-    for name in items:
-        if hasattr(sdk.CorsairDeviceType, name):
-            out.append(enum_to_int(getattr(sdk.CorsairDeviceType, name)))
-        else:
-            try:
-                out.append(int(name))
-            except Exception:
-                pass
-    return out
+    values = [_device_type_value(name, sdk) for name in _split_type_names(value)]
+    return [v for v in values if v is not None]
 
 
 def parse_device_type_mask(value, sdk):
-    def enum_to_int(v):
-        if hasattr(v, "value"):
-            return int(v.value)
-        return int(v)
-
     if value is None:
         return getattr(sdk.CorsairDeviceType, "CDT_All", 0xFFFFFFFF)
     if isinstance(value, int):
@@ -1866,47 +2144,45 @@ def parse_device_type_mask(value, sdk):
     if isinstance(value, str):
         s = value.strip()
         if "|" in s or "," in s:
-            parts = [p.strip() for p in s.replace(",", "|").split("|")]
-            items = [p for p in parts if p]
+            items = _split_type_names(s)
         else:
-            if hasattr(sdk.CorsairDeviceType, s):
-                return enum_to_int(getattr(sdk.CorsairDeviceType, s))
-            try:
-                return int(s)
-            except Exception:
-                return getattr(sdk.CorsairDeviceType, "CDT_All", 0xFFFFFFFF)
+            v = _device_type_value(s, sdk)
+            if v is not None:
+                return v
+            return getattr(sdk.CorsairDeviceType, "CDT_All", 0xFFFFFFFF)
     elif isinstance(value, (list, tuple, set)):
-        items = [str(p).strip() for p in value if str(p).strip()]
+        items = _split_type_names(value)
 
     if items:
         mask = 0
-        for name in items:
-            if hasattr(sdk.CorsairDeviceType, name):
-                mask |= enum_to_int(getattr(sdk.CorsairDeviceType, name))
-            else:
-                try:
-                    mask |= int(name)
-                except Exception:
-                    pass
+        for v in parse_device_types(items, sdk):
+            mask |= v
         if mask:
             return mask
 
     return getattr(sdk.CorsairDeviceType, "CDT_All", 0xFFFFFFFF)
 
 
+@functools.lru_cache(maxsize=32)
+def _device_type_set(sdk, name):
+    return frozenset(parse_device_types([name], sdk))
+
+
 def build_groups(cfg_groups, mapper, sdk, default_protocol, default_host, cfg=None):
     groups = []
     used_ids = set()
     if not cfg_groups:
         return groups
-    mouse_types = set(parse_device_types(["CDT_Mouse"], sdk))
-    mousemat_types = set(parse_device_types(["CDT_Mousemat"], sdk))
-    cooler_types = set(parse_device_types(["CDT_Cooler"], sdk))
+    mouse_types = _device_type_set(sdk, "CDT_Mouse")
+    mousemat_types = _device_type_set(sdk, "CDT_Mousemat")
+    cooler_types = _device_type_set(sdk, "CDT_Cooler")
+    ram_types = _device_type_set(sdk, "CDT_MemoryModule")
     pump_wb = parse_white_balance(cfg.get("aio_pump_white_balance")) if cfg else None
     for idx, grp in enumerate(cfg_groups):
         name = grp.get("name") or f"groupe_{idx+1}"
+        norm_name = _normalize_name(name)
         keepalive_reapply_group = grp.get("keepalive_reapply")
-        if keepalive_reapply_group is None and _normalize_name(name) in (
+        if keepalive_reapply_group is None and norm_name in (
             "souris_tapis",
             "mouse_tapis",
             "mousemat_mouse",
@@ -1918,15 +2194,15 @@ def build_groups(cfg_groups, mapper, sdk, default_protocol, default_host, cfg=No
         udp_host = grp.get("udp_host", default_host)
         protocol = normalize_protocol(grp.get("protocol"), default_protocol)
 
-        device_ids = [s.lower() for s in _normalize_list(grp.get("device_ids"))]
-        include_types = parse_device_types(grp.get("device_types_include"), sdk)
-        exclude_types = parse_device_types(grp.get("device_types_exclude"), sdk)
-        model_contains = _normalize_list(grp.get("model_contains") or grp.get("model"))
-        serial_contains = _normalize_list(grp.get("serial_contains") or grp.get("serial"))
+        device_ids = frozenset(s.lower() for s in _normalize_list(grp.get("device_ids")))
+        include_types = frozenset(parse_device_types(grp.get("device_types_include"), sdk))
+        exclude_types = frozenset(parse_device_types(grp.get("device_types_exclude"), sdk))
+        model_contains = _contains_patterns(grp.get("model_contains") or grp.get("model"))
+        serial_contains = _contains_patterns(grp.get("serial_contains") or grp.get("serial"))
 
         selected = []
         for dev in mapper.devices:
-            dev_id_str = str(dev.get("device_id_str") or dev.get("device_id")).lower()
+            dev_id_str = dev["device_id_lc"]
             if device_ids and dev_id_str not in device_ids:
                 continue
             if include_types and dev.get("device_type") not in include_types:
@@ -1941,29 +2217,28 @@ def build_groups(cfg_groups, mapper, sdk, default_protocol, default_host, cfg=No
 
         sort_key = (grp.get("device_sort") or "").strip().lower()
         if cfg and cfg.get("ram_match_group_order", False):
-            if _normalize_name(name) in ("ram", "memory"):
+            if norm_name in ("ram", "memory"):
                 sort_key = ""
             else:
-                include_types_for_ram = parse_device_types(["CDT_MemoryModule"], sdk)
-                if include_types_for_ram and include_types:
-                    if any(t in include_types for t in include_types_for_ram):
-                        sort_key = ""
+                if ram_types & include_types:
+                    sort_key = ""
         if sort_key:
-            selected = sorted(selected, key=lambda d: _device_sort_key(d, sort_key))
+            selected = sorted(selected, key=_make_device_sort_key(sort_key))
         else:
             # For mixed mouse+mousemat groups, keep a deterministic order:
             # mousemat first, mouse last. This avoids stream index drift.
             has_mouse = any(dev.get("device_type") in mouse_types for dev in selected)
             has_mousemat = any(dev.get("device_type") in mousemat_types for dev in selected)
             if has_mouse and has_mousemat:
-                mats = [dev for dev in selected if dev.get("device_type") in mousemat_types]
-                mice = [dev for dev in selected if dev.get("device_type") in mouse_types]
-                others = [
-                    dev
-                    for dev in selected
-                    if dev.get("device_type") not in mousemat_types
-                    and dev.get("device_type") not in mouse_types
-                ]
+                mats, mice, others = [], [], []
+                for dev in selected:
+                    dev_type = dev.get("device_type")
+                    if dev_type in mousemat_types:
+                        mats.append(dev)
+                    elif dev_type in mouse_types:
+                        mice.append(dev)
+                    else:
+                        others.append(dev)
                 selected = mats + mice + others
 
         if not selected:
@@ -1971,13 +2246,11 @@ def build_groups(cfg_groups, mapper, sdk, default_protocol, default_host, cfg=No
             continue
 
         for dev in selected:
-            dev_id_str = str(dev.get("device_id_str") or dev.get("device_id")).lower()
+            dev_id_str = dev["device_id_lc"]
             if dev_id_str in used_ids:
                 raise RuntimeError(
                     f"Appareil duplique entre groupes: {dev_id_str} ({name})"
                 )
-        for dev in selected:
-            dev_id_str = str(dev.get("device_id_str") or dev.get("device_id")).lower()
             used_ids.add(dev_id_str)
 
         map_list = []
@@ -1990,11 +2263,10 @@ def build_groups(cfg_groups, mapper, sdk, default_protocol, default_host, cfg=No
 
         ram_layout = (grp.get("ram_group_layout") or cfg.get("ram_group_layout") if cfg else "").lower()
         is_ram_group = False
-        if _normalize_name(name) in ("ram", "memory"):
+        if norm_name in ("ram", "memory"):
             is_ram_group = True
         elif include_types:
-            ram_types = set(parse_device_types(["CDT_MemoryModule"], sdk))
-            if ram_types and all(t in ram_types for t in include_types):
+            if ram_types and include_types <= ram_types:
                 is_ram_group = True
 
         if is_ram_group and ram_layout == "rows":
@@ -2035,10 +2307,11 @@ def build_groups(cfg_groups, mapper, sdk, default_protocol, default_host, cfg=No
                     )
                 if pump_split:
                     start_side = cfg.get("aio_pump_angle_start") if cfg else "left"
+                    positions = mapper.positions_by_device.get(device_id)
                     orders = None
                     if cfg:
                         orders = _build_aio_cluster_orders(
-                            mapper.positions_by_device.get(device_id),
+                            positions,
                             cluster_count=cfg.get("aio_cluster_count", 3),
                             group_sort=cfg.get("aio_cluster_sort", "x"),
                             group_order=cfg.get("aio_cluster_order"),
@@ -2051,7 +2324,7 @@ def build_groups(cfg_groups, mapper, sdk, default_protocol, default_host, cfg=No
                         )
                     allowed_indices = orders[0] if orders else None
                     pairs = _build_pump_lr_pairs(
-                        mapper.positions_by_device.get(device_id),
+                        positions,
                         start=start_side or "left",
                         flip_x=cfg.get("aio_flip_x", False) if cfg else False,
                         flip_y=cfg.get("aio_flip_y", False) if cfg else False,
@@ -2063,34 +2336,26 @@ def build_groups(cfg_groups, mapper, sdk, default_protocol, default_host, cfg=No
                         order = []
                         full_order = mapper.get_device_order(device_id)
                         allowed_set = set(allowed_indices) if allowed_indices else None
+                        append = map_list.append
                         for pair in pairs:
                             if not pair:
                                 continue
                             base_idx = len(map_list)
-                            if pump_wb:
-                                map_list.append((device_id, pair[0], None, pump_wb))
-                            else:
-                                map_list.append((device_id, pair[0]))
-                            order.append(pair[0])
+                            append((device_id, pair[0], None, pump_wb))
                             if len(pair) > 1:
-                                if pump_wb:
-                                    map_list.append(
-                                        (device_id, pair[1], base_idx, pump_wb)
-                                    )
-                                else:
-                                    map_list.append((device_id, pair[1], base_idx))
-                                order.append(pair[1])
+                                append((device_id, pair[1], base_idx, pump_wb))
+                            order.extend(pair[:2])
                         # Append remaining LEDs (ex: ventilos AIO) after the pump
                         for idx_led in full_order:
                             if allowed_set is not None and idx_led in allowed_set:
                                 continue
-                            map_list.append((device_id, idx_led))
+                            map_list.append((device_id, idx_led, None, None))
                             order.append(idx_led)
                 if order is None:
                     order = mapper.get_device_order(device_id)
                     start_idx = len(map_list)
                     for i in order:
-                        map_list.append((device_id, i))
+                        map_list.append((device_id, i, None, None))
                 if order:
                     device_ranges[device_id] = (start_idx, len(order))
             if dev.get("device_type") in mouse_types:
@@ -2107,14 +2372,13 @@ def build_groups(cfg_groups, mapper, sdk, default_protocol, default_host, cfg=No
                 start_idx, length = mat_range
                 if length > 0:
                     src_index = start_idx + (length // 2)
-                    new_map = []
+                    linked_map = []
                     for entry in map_list:
-                        device_id, led_idx = entry
-                        if device_id in mouse_ids:
-                            new_map.append((device_id, led_idx, src_index))
-                        else:
-                            new_map.append(entry)
-                    map_list = new_map
+                        did, li, _, wb = entry
+                        if did in mouse_ids:
+                            entry = (did, li, src_index, wb)
+                        linked_map.append(entry)
+                    map_list = linked_map
 
         groups.append(
             {
@@ -2136,17 +2400,17 @@ def build_groups(cfg_groups, mapper, sdk, default_protocol, default_host, cfg=No
 
 
 def build_group_all(mapper, default_protocol, udp_host, group_port, cfg=None, sdk=None):
-    device_labels = []
-    for dev in mapper.devices:
-        label = dev.get("model") or dev.get("device_id_str")
-        if label:
-            device_labels.append(str(label))
+    device_labels = [
+        str(label)
+        for label in (dev.get("model") or dev.get("device_id_str") for dev in mapper.devices)
+        if label
+    ]
     ram_types = None
     ram_layout = None
     if cfg and sdk:
         ram_layout = (cfg.get("ram_group_layout") or "").lower()
         if ram_layout == "rows":
-            ram_types = set(parse_device_types(["CDT_MemoryModule"], sdk))
+            ram_types = _device_type_set(sdk, "CDT_MemoryModule")
     return [
         {
             "name": "groupe",
@@ -2163,6 +2427,14 @@ def build_group_all(mapper, default_protocol, udp_host, group_port, cfg=None, sd
 
 def build_group_fusion(cfg, mapper, sdk, default_protocol, udp_host, fusion_port):
     groups_cfg = cfg.get("groups") or []
+    order_cache = {}
+
+    def device_order(device_id):
+        order = order_cache.get(device_id)
+        if order is None:
+            order = order_cache[device_id] = mapper.get_device_order(device_id)
+        return order
+
     groups_by_name = {}
     for grp in groups_cfg:
         name = (grp.get("name") or "").strip().lower()
@@ -2177,16 +2449,17 @@ def build_group_fusion(cfg, mapper, sdk, default_protocol, udp_host, fusion_port
         return None
 
     def select_devices(grp, force_types=None):
-        device_ids = [s.lower() for s in _normalize_list(grp.get("device_ids"))] if grp else []
-        include_types = parse_device_types(grp.get("device_types_include"), sdk) if grp else []
-        if force_types:
-            include_types = list(force_types)
-        exclude_types = parse_device_types(grp.get("device_types_exclude"), sdk) if grp else []
-        model_contains = _normalize_list(grp.get("model_contains") or grp.get("model")) if grp else []
-        serial_contains = _normalize_list(grp.get("serial_contains") or grp.get("serial")) if grp else []
+        grp = grp or {}
+        device_ids = frozenset(s.lower() for s in _normalize_list(grp.get("device_ids")))
+        include_types = frozenset(
+            force_types or parse_device_types(grp.get("device_types_include"), sdk)
+        )
+        exclude_types = frozenset(parse_device_types(grp.get("device_types_exclude"), sdk))
+        model_contains = _contains_patterns(grp.get("model_contains") or grp.get("model"))
+        serial_contains = _contains_patterns(grp.get("serial_contains") or grp.get("serial"))
         selected = []
         for dev in mapper.devices:
-            dev_id_str = str(dev.get("device_id_str") or dev.get("device_id")).lower()
+            dev_id_str = dev["device_id_lc"]
             if device_ids and dev_id_str not in device_ids:
                 continue
             if include_types and dev.get("device_type") not in include_types:
@@ -2198,43 +2471,31 @@ def build_group_fusion(cfg, mapper, sdk, default_protocol, udp_host, fusion_port
             if serial_contains and not _match_contains(dev.get("serial"), serial_contains):
                 continue
             selected.append(dev)
-        sort_key = (grp.get("device_sort") or "").strip().lower() if grp else ""
+        sort_key = (grp.get("device_sort") or "").strip().lower()
         if sort_key:
-            selected = sorted(selected, key=lambda d: _device_sort_key(d, sort_key))
+            selected = sorted(selected, key=_make_device_sort_key(sort_key))
         return selected
 
     def ram_axis_order(dev, prefer_axis="auto"):
         device_id = dev["device_id"]
-        positions = mapper.positions_by_device.get(device_id) or []
-        pts = []
-        for idx, pos in enumerate(positions):
-            x = pos.get("x")
-            y = pos.get("y")
-            if x is None or y is None:
-                pts = []
-                break
-            pts.append((idx, float(x), float(y)))
+        pts = mapper._device_points(device_id)
         if not pts:
-            return mapper.get_device_order(device_id)
-        xs = [p[1] for p in pts]
-        ys = [p[2] for p in pts]
-        prefer_axis = (prefer_axis or "auto").lower()
-        rx = max(xs) - min(xs)
-        ry = max(ys) - min(ys)
-        axis = prefer_axis
+            return device_order(device_id)
+        _, xs, ys = zip(*pts)
+        axis = (prefer_axis or "auto").lower()
         if axis == "auto":
-            axis = "x" if rx >= ry else "y"
+            axis = "x" if max(xs) - min(xs) >= max(ys) - min(ys) else "y"
         if axis == "x":
-            pts.sort(key=lambda p: (p[1], p[2]))
+            key = operator.itemgetter(1, 2)
         else:
-            pts.sort(key=lambda p: (p[2], p[1]))
-        return [p[0] for p in pts]
-
-    keyboard_types = parse_device_types(["CDT_Keyboard"], sdk)
-    mousemat_types = parse_device_types(["CDT_Mousemat"], sdk)
-    mouse_types = parse_device_types(["CDT_Mouse"], sdk)
-    ram_types = parse_device_types(["CDT_MemoryModule"], sdk)
-    cooler_types = parse_device_types(["CDT_Cooler"], sdk)
+            key = operator.itemgetter(2, 1)
+        return [p[0] for p in sorted(pts, key=key)]
+
+    keyboard_types = _device_type_set(sdk, "CDT_Keyboard")
+    mousemat_types = _device_type_set(sdk, "CDT_Mousemat")
+    mouse_types = _device_type_set(sdk, "CDT_Mouse")
+    ram_types = _device_type_set(sdk, "CDT_MemoryModule")
+    cooler_types = _device_type_set(sdk, "CDT_Cooler")
     fan_types = parse_device_types(cfg.get("fan_device_types"), sdk)
     if not fan_types:
         fan_types = parse_device_types(["CDT_LedController", "CDT_Fan"], sdk)
@@ -2264,24 +2525,20 @@ def build_group_fusion(cfg, mapper, sdk, default_protocol, udp_host, fusion_port
 
     def add_device(device_id, label, indices, src_index=None, dedupe=False):
         ensure_device(device_id, label)
-        used = used_leds.setdefault(device_id, set())
-        if src_index is None:
-            for i in indices:
-                if dedupe and i in used:
-                    continue
-                map_list.append((device_id, i))
-                used.add(i)
-        else:
-            for i in indices:
-                if dedupe and i in used:
-                    continue
-                map_list.append((device_id, i, src_index))
-                used.add(i)
+        # LEDs deja utilisees: un masque de bits par device
+        used = used_leds.get(device_id, 0)
+        for i in indices:
+            bit = 1 << i
+            if dedupe and used & bit:
+                continue
+            map_list.append((device_id, i, src_index, None))
+            used |= bit
+        used_leds[device_id] = used
 
     def add_devices(devices):
         for dev in devices:
             device_id = dev["device_id"]
-            order = mapper.get_device_order(device_id)
+            order = device_order(device_id)
             label = str(dev.get("model") or dev.get("device_id_str") or device_id)
             add_device(device_id, label, order)
 
@@ -2297,7 +2554,7 @@ def build_group_fusion(cfg, mapper, sdk, default_protocol, udp_host, fusion_port
     mousemat_len = 0
     for dev in mousemat_devices:
         device_id = dev["device_id"]
-        order = mapper.get_device_order(device_id)
+        order = device_order(device_id)
         label = str(dev.get("model") or dev.get("device_id_str") or device_id)
         add_device(device_id, label, order)
         mousemat_len += len(order)
@@ -2309,7 +2566,7 @@ def build_group_fusion(cfg, mapper, sdk, default_protocol, udp_host, fusion_port
         src_index = mousemat_start + (mousemat_len // 2)
     for dev in mouse_devices:
         device_id = dev["device_id"]
-        order = mapper.get_device_order(device_id)
+        order = device_order(device_id)
         label = str(dev.get("model") or dev.get("device_id_str") or device_id)
         add_device(device_id, label, order, src_index=src_index)
 
@@ -2321,36 +2578,34 @@ def build_group_fusion(cfg, mapper, sdk, default_protocol, udp_host, fusion_port
     aio_dir = cfg.get("aio_angle_direction", "clockwise")
     pump_start = cfg.get("aio_pump_angle_start") or aio_start
     pump_dir = cfg.get("aio_pump_angle_direction") or aio_dir
+    aio_flip_x = cfg.get("aio_flip_x", False)
+    aio_flip_y = cfg.get("aio_flip_y", False)
+    aio_swap_xy = cfg.get("aio_swap_xy", False)
+    aio_cluster_kwargs = {
+        "cluster_count": cfg.get("aio_cluster_count", 3),
+        "group_sort": cfg.get("aio_cluster_sort", "x"),
+        "group_order": cfg.get("aio_cluster_order"),
+        "flip_x": aio_flip_x,
+        "flip_y": aio_flip_y,
+        "swap_xy": aio_swap_xy,
+        "pump_first": True,
+    }
     for dev in aio_devices:
         device_id = dev["device_id"]
         positions = mapper.positions_by_device.get(device_id)
         orders_pump = _build_aio_cluster_orders(
-            positions,
-            cluster_count=cfg.get("aio_cluster_count", 3),
-            group_sort=cfg.get("aio_cluster_sort", "x"),
-            group_order=cfg.get("aio_cluster_order"),
-            start=pump_start,
-            direction=pump_dir,
-            flip_x=cfg.get("aio_flip_x", False),
-            flip_y=cfg.get("aio_flip_y", False),
-            swap_xy=cfg.get("aio_swap_xy", False),
-            pump_first=True,
-        )
-        orders_fans = _build_aio_cluster_orders(
-            positions,
-            cluster_count=cfg.get("aio_cluster_count", 3),
-            group_sort=cfg.get("aio_cluster_sort", "x"),
-            group_order=cfg.get("aio_cluster_order"),
-            start=aio_start,
-            direction=aio_dir,
-            flip_x=cfg.get("aio_flip_x", False),
-            flip_y=cfg.get("aio_flip_y", False),
-            swap_xy=cfg.get("aio_swap_xy", False),
-            pump_first=True,
+            positions, start=pump_start, direction=pump_dir, **aio_cluster_kwargs
         )
+        if pump_start == aio_start and pump_dir == aio_dir:
+            # Memes parametres: inutile de refaire le clustering
+            orders_fans = orders_pump
+        else:
+            orders_fans = _build_aio_cluster_orders(
+                positions, start=aio_start, direction=aio_dir, **aio_cluster_kwargs
+            )
         orders = orders_pump or orders_fans
         if not orders:
-            full_order = mapper.get_device_order(device_id)
+            full_order = device_order(device_id)
             aio_pump_orders.append((dev, full_order, positions))
             continue
         aio_pump_orders.append((dev, (orders_pump or orders)[0], positions))
@@ -2365,39 +2620,33 @@ def build_group_fusion(cfg, mapper, sdk, default_protocol, udp_host, fusion_port
     def add_aio_pump():
         pump_split = bool(cfg.get("aio_pump_split"))
         pump_wb = parse_white_balance(cfg.get("aio_pump_white_balance"))
+        start_side = cfg.get("aio_pump_angle_start") or "left"
         for dev, order, positions in aio_pump_orders:
             device_id = dev["device_id"]
             label = str(dev.get("model") or dev.get("device_id_str") or device_id)
             if pump_split:
-                start_side = cfg.get("aio_pump_angle_start") or "left"
                 pairs = _build_pump_lr_pairs(
                     positions,
                     start=start_side,
-                    flip_x=cfg.get("aio_flip_x", False),
-                    flip_y=cfg.get("aio_flip_y", False),
-                    swap_xy=cfg.get("aio_swap_xy", False),
+                    flip_x=aio_flip_x,
+                    flip_y=aio_flip_y,
+                    swap_xy=aio_swap_xy,
                     allowed_indices=(order if isinstance(order, (list, tuple)) else None),
                 )
                 if pairs:
                     ensure_device(device_id, label)
-                    used = used_leds.setdefault(device_id, set())
+                    used = used_leds.get(device_id, 0)
+                    append = map_list.append
                     for pair in pairs:
                         if not pair:
                             continue
                         base_idx = len(map_list)
-                        if pump_wb:
-                            map_list.append((device_id, pair[0], None, pump_wb))
-                        else:
-                            map_list.append((device_id, pair[0]))
-                        used.add(pair[0])
+                        append((device_id, pair[0], None, pump_wb))
+                        used |= 1 << pair[0]
                         if len(pair) > 1:
-                            if pump_wb:
-                                map_list.append(
-                                    (device_id, pair[1], base_idx, pump_wb)
-                                )
-                            else:
-                                map_list.append((device_id, pair[1], base_idx))
-                            used.add(pair[1])
+                            append((device_id, pair[1], base_idx, pump_wb))
+                            used |= 1 << pair[1]
+                    used_leds[device_id] = used
                     continue
             add_device(device_id, label, order)
 
@@ -2408,10 +2657,12 @@ def build_group_fusion(cfg, mapper, sdk, default_protocol, udp_host, fusion_port
         leds_per_fan = 0
     for dev in case_fan_devices:
         device_id = dev["device_id"]
-        order = mapper.get_device_order(device_id)
+        order = device_order(device_id)
         if leds_per_fan and order and len(order) >= leds_per_fan and len(order) % leds_per_fan == 0:
-            for i in range(0, len(order), leds_per_fan):
-                case_segments.append((dev, order[i : i + leds_per_fan]))
+            case_segments += [
+                (dev, order[i : i + leds_per_fan])
+                for i in range(0, len(order), leds_per_fan)
+            ]
         else:
             case_segments.append((dev, order))
 
@@ -2446,23 +2697,15 @@ def build_group_fusion(cfg, mapper, sdk, default_protocol, udp_host, fusion_port
                     device_id = dev["device_id"]
                     label = str(dev.get("model") or dev.get("device_id_str") or device_id)
                     ensure_device(device_id, label)
-                for device_id, led_idx in _build_ram_interleaved_map(ram_devices, mapper):
-                    map_list.append((device_id, led_idx))
+                map_list.extend(_build_ram_interleaved_map(ram_devices, mapper))
             else:
                 for dev in ram_devices:
                     device_id = dev["device_id"]
-                    order = mapper.get_device_order(device_id)
+                    order = device_order(device_id)
                     label = str(dev.get("model") or dev.get("device_id_str") or device_id)
                     add_device(device_id, label, order)
         else:
-            ram_devices = sorted(
-                ram_devices,
-                key=lambda d: (
-                    d.get("center_x") is None,
-                    d.get("center_x", 0.0),
-                    d.get("center_y", 0.0),
-                ),
-            )
+            ram_devices = sorted(ram_devices, key=_make_device_sort_key("xy"))
             ram_mode = (cfg.get("fusion_ram_mode") or "sticks").lower()
             mirror = bool(cfg.get("fusion_ram_mirror", False))
             ram_axis = (cfg.get("fusion_ram_led_axis") or "auto").lower()
@@ -2481,7 +2724,7 @@ def build_group_fusion(cfg, mapper, sdk, default_protocol, udp_host, fusion_port
                         device_id = dev["device_id"]
                         label = str(dev.get("model") or dev.get("device_id_str") or device_id)
                         ensure_device(device_id, label)
-                        map_list.append((device_id, order[i]))
+                        map_list.append((device_id, order[i], None, None))
             else:
                 for idx_dev, dev in enumerate(ram_devices):
                     device_id = dev["device_id"]
@@ -2515,28 +2758,25 @@ def build_group_fusion(cfg, mapper, sdk, default_protocol, udp_host, fusion_port
 def _build_full_map(mapper):
     map_list = []
     for device_id in mapper.led_colors_by_device.keys():
-        order = mapper.get_device_order(device_id)
-        for i in order:
-            map_list.append((device_id, i))
+        map_list += [(device_id, i, None, None) for i in mapper.get_device_order(device_id)]
     return map_list
 
 
 def _build_ram_interleaved_map(devices, mapper):
     if not devices:
         return []
-    stick_orders = []
+    # Une colonne d'entrees par barrette, lues ligne par ligne
+    columns = []
     for dev in devices:
         device_id = dev["device_id"]
         order = mapper.get_device_order(device_id)
-        stick_orders.append((dev, order))
-    max_len = max((len(order) for _dev, order in stick_orders), default=0)
-    map_list = []
-    for i in range(max_len):
-        for dev, order in stick_orders:
-            if i >= len(order):
-                continue
-            map_list.append((dev["device_id"], order[i]))
-    return map_list
+        columns.append([(device_id, li, None, None) for li in order])
+    return [
+        entry
+        for row in itertools.zip_longest(*columns)
+        for entry in row
+        if entry is not None
+    ]
 
 
 def _build_full_map_with_ram(mapper, ram_types=None, ram_layout=None):
@@ -2546,40 +2786,42 @@ def _build_full_map_with_ram(mapper, ram_types=None, ram_layout=None):
     if not ram_devices:
         return _build_full_map(mapper)
     ram_map = _build_ram_interleaved_map(ram_devices, mapper)
-    ram_ids = {dev["device_id"] for dev in ram_devices}
+    ram_ids = frozenset(dev["device_id"] for dev in ram_devices)
     map_list = []
     inserted = False
     for dev in mapper.devices:
         device_id = dev["device_id"]
         if device_id in ram_ids:
             if not inserted:
-                map_list.extend(ram_map)
+                map_list += ram_map
                 inserted = True
             continue
-        order = mapper.get_device_order(device_id)
-        for i in order:
-            map_list.append((device_id, i))
+        map_list += [(device_id, i, None, None) for i in mapper.get_device_order(device_id)]
     if not inserted:
         map_list.extend(ram_map)
     return map_list
 
 
-def get_groups_for_mode(mode, cfg, mapper, sdk, default_protocol, args):
-    if mode == "group":
-        group_port = args.group_port or cfg.get("group_port", 34983)
-        return build_group_all(
-            mapper, default_protocol, cfg.get("udp_host", "0.0.0.0"), group_port, cfg=cfg, sdk=sdk
-        )
-    if mode == "fusion":
-        fusion_port = args.fusion_port or cfg.get("fusion_port", 34984)
-        return build_group_fusion(
-            cfg,
-            mapper,
-            sdk,
-            default_protocol,
-            cfg.get("udp_host", "0.0.0.0"),
-            fusion_port,
-        )
+def _groups_for_group_mode(cfg, mapper, sdk, default_protocol, args):
+    group_port = args.group_port or cfg.get("group_port", 34983)
+    return build_group_all(
+        mapper, default_protocol, cfg.get("udp_host", "0.0.0.0"), group_port, cfg=cfg, sdk=sdk
+    )
+
+
+def _groups_for_fusion_mode(cfg, mapper, sdk, default_protocol, args):
+    fusion_port = args.fusion_port or cfg.get("fusion_port", 34984)
+    return build_group_fusion(
+        cfg,
+        mapper,
+        sdk,
+        default_protocol,
+        cfg.get("udp_host", "0.0.0.0"),
+        fusion_port,
+    )
+
+
+def _groups_for_unique_mode(cfg, mapper, sdk, default_protocol, args):
     groups_cfg = cfg.get("groups") or []
     groups = build_groups(
         groups_cfg,
@@ -2594,49 +2836,168 @@ def get_groups_for_mode(mode, cfg, mapper, sdk, default_protocol, args):
     return groups
 
 
-def setup_runtime(groups):
-    sel = selectors.DefaultSelector()
+_MODE_GROUP_BUILDERS = {
+    "group": _groups_for_group_mode,
+    "fusion": _groups_for_fusion_mode,
+}
+
+
+def get_groups_for_mode(mode, cfg, mapper, sdk, default_protocol, args, cache=None):
+    # cache: groupes deja construits pour ce mapper (changements de mode)
+    if cache is not None:
+        cached = cache.get(mode)
+        if cached is not None and cached[0] is mapper:
+            return cached[1]
+    builder = _MODE_GROUP_BUILDERS.get(mode, _groups_for_unique_mode)
+    groups = builder(cfg, mapper, sdk, default_protocol, args)
+    if cache is not None:
+        cache[mode] = (mapper, groups)
+    return groups
+
+
+def _get_bridge_selector():
+    global _BRIDGE_SELECTOR
+    if _BRIDGE_SELECTOR is None:
+        _BRIDGE_SELECTOR = selectors.DefaultSelector()
+    return _BRIDGE_SELECTOR
+
+
+def _open_udp_socket(host_port, rcvbuf=_UDP_RCVBUF):
+    # Linux: non bloquant + cloexec des la creation (pas de fcntl en plus)
+    sock = socket.socket(socket.AF_INET, _UDP_SOCK_TYPE)
+    if rcvbuf:
+        try:
+            # Buffer de reception large: evite de perdre des trames en rafale
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+        except OSError:
+            pass
+    try:
+        sock.bind(host_port)
+        if not _UDP_SOCK_NONBLOCK:
+            sock.setblocking(False)
+    except Exception:
+        sock.close()
+        raise
+    return sock
+
+
+def _group_key(g):
+    return (
+        g.get("name"),
+        g.get("udp_host"),
+        int(g.get("udp_port", 0)),
+        g.get("led_count"),
+    )
+
+
+def setup_runtime(groups, rcvbuf=_UDP_RCVBUF, prior=None):
+    sel = _get_bridge_selector()
+    # Reconnexion: les sockets deja ouverts sur le meme host:port sont repris
+    # tels quels (pas de unbind/rebind, pas de EADDRINUSE)
+    prior_by_port = {}
+    for pg in prior or ():
+        if pg.get("sock") is not None:
+            prior_by_port[(pg["udp_host"], int(pg["udp_port"]))] = pg
+    adopted = []
     bound = set()
     runtime_groups = []
-    for g in groups:
-        if g.get("led_count", 0) <= 0:
-            print(f"Avertissement: groupe '{g['name']}' sans LEDs, ignore.")
-            continue
-        host_port = (g["udp_host"], int(g["udp_port"]))
-        if host_port in bound:
-            raise RuntimeError(f"Port duplique: {host_port[0]}:{host_port[1]}")
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.bind(host_port)
-        sock.setblocking(False)
-        g["sock"] = sock
-        g["frame_buffer"] = bytearray(g["led_count"] * 3)
-        now = time.monotonic()
-        g["last_send"] = now
-        g["first_packet"] = True
-        g["pkt_count"] = 0
-        g["byte_count"] = 0
-        g["stats_ts"] = now
-        g["last_packet_ts"] = 0.0
-        g["fail_count"] = 0
-        g["idle_cleared"] = False
-        g["idle_clear_disabled"] = bool(g.get("idle_clear_disabled", False))
-        idle_clear_seconds = g.get("idle_clear_seconds")
-        try:
-            g["idle_clear_seconds"] = (
-                max(0.2, float(idle_clear_seconds))
-                if idle_clear_seconds is not None
-                else None
-            )
-        except Exception:
-            g["idle_clear_seconds"] = None
-        g["keepalive_interval"] = g.get("keepalive_interval")
-        g["last_keepalive"] = now
-        sel.register(sock, selectors.EVENT_READ, data=g)
-        bound.add(host_port)
-        runtime_groups.append(g)
+    sock = None
+    try:
+        for g in groups:
+            if g.get("led_count", 0) <= 0:
+                print(f"Avertissement: groupe '{g['name']}' sans LEDs, ignore.")
+                continue
+            host_port = (g["udp_host"], int(g["udp_port"]))
+            if host_port in bound:
+                raise RuntimeError(f"Port duplique: {host_port[0]}:{host_port[1]}")
+            old = prior_by_port.pop(host_port, None)
+            if old is not None:
+                g["sock"] = old["sock"]
+                old["sock"] = None
+                adopted.append((old, g["sock"]))
+                same = _group_key(old) == _group_key(g)
+                _init_runtime_group(g, old if same else None)
+                sel.modify(g["sock"], selectors.EVENT_READ, data=g)
+            else:
+                sock = _open_udp_socket(host_port, rcvbuf)
+                g["sock"] = sock
+                _init_runtime_group(g)
+                sel.register(sock, selectors.EVENT_READ, data=g)
+                sock = None
+            bound.add(host_port)
+            runtime_groups.append(g)
+    except Exception:
+        # Rend les sockets repris a leurs groupes d'origine, puis ferme le reste
+        # sans laisser d'orphelins dans le selecteur partage
+        adopted_socks = set()
+        for old, old_sock in adopted:
+            old["sock"] = old_sock
+            adopted_socks.add(old_sock)
+            try:
+                sel.modify(old_sock, selectors.EVENT_READ, data=old)
+            except Exception:
+                pass
+        close_runtime(
+            sel, [g for g in runtime_groups if g.get("sock") not in adopted_socks]
+        )
+        if sock is not None:
+            try:
+                sock.close()
+            except Exception:
+                pass
+        raise
     return sel, runtime_groups
 
 
+def _pooled_frame_buffer(key, led_count):
+    # Reconnexion/changement de mode: meme buffer si la topologie est identique.
+    # Cle = nom + endpoint + LEDs: deux groupes homonymes ne partagent rien
+    buf = _FRAME_BUFFER_POOL.get(key)
+    if buf is None:
+        buf = _FRAME_BUFFER_POOL[key] = bytearray(led_count * 3)
+    else:
+        _clear_tail(buf, 0)
+    return buf
+
+
+def _init_runtime_group(g, prior=None):
+    if prior is not None and prior.get("frame_buffer") is not None:
+        g["frame_buffer"] = prior["frame_buffer"]
+    else:
+        g["frame_buffer"] = _pooled_frame_buffer(_group_key(g), g["led_count"])
+    now = time.monotonic()
+    g["last_send"] = now
+    g["first_packet"] = True
+    g["pkt_count"] = 0
+    g["byte_count"] = 0
+    g["stats_ts"] = now
+    g["last_packet_ts"] = 0.0
+    g["fail_count"] = 0
+    g["idle_cleared"] = False
+    g["idle_clear_disabled"] = bool(g.get("idle_clear_disabled", False))
+    idle_clear_seconds = g.get("idle_clear_seconds")
+    try:
+        g["idle_clear_seconds"] = (
+            max(0.2, float(idle_clear_seconds))
+            if idle_clear_seconds is not None
+            else None
+        )
+    except Exception:
+        g["idle_clear_seconds"] = None
+    g["keepalive_interval"] = g.get("keepalive_interval")
+    g["last_keepalive"] = now
+    # Cles toujours presentes: la boucle principale indexe sans .get()
+    g.setdefault("keepalive_reapply", None)
+    # Mode normalise une fois (partial pre-lie, regroupement par mode)
+    g["update_mode"] = (g.get("update_mode") or "auto").lower()
+    g["ddp_auto"] = False
+    if prior is not None:
+        # Groupe identique apres reconnexion: flux et stats continuent
+        for key in _RUNTIME_CARRY_KEYS:
+            if key in prior:
+                g[key] = prior[key]
+
+
 def close_runtime(sel, runtime_groups):
     for g in runtime_groups:
         sock = g.get("sock")
@@ -2651,47 +3012,109 @@ def close_runtime(sel, runtime_groups):
                 pass
 
 
+def _idle_clear_pass(runtime_groups, now, any_active_recent, default_clear_s, logger):
+    # Retourne (prochaine echeance, passage sans groupe actif)
+    if not any_active_recent:
+        return float("inf"), True
+    next_due = float("inf")
+    for g in runtime_groups:
+        if g["idle_clear_disabled"] or g["idle_cleared"]:
+            continue
+        clear_after = g["idle_clear_seconds"]
+        if clear_after is None:
+            clear_after = default_clear_s
+        last_pkt = g["last_packet_ts"]
+        if not last_pkt:
+            continue
+        idle_for = now - last_pkt
+        if idle_for < clear_after:
+            next_due = min(next_due, last_pkt + clear_after)
+            continue
+        try:
+            frame = g["frame_buffer"]
+            _clear_tail(frame, 0)
+            ok = g["apply_frame"](frame)
+            if ok:
+                g["last_send"] = now
+                g["fail_count"] = 0
+                g["idle_cleared"] = True
+                logger.info(
+                    "UDP[%s]: clear idle apres %.1fs",
+                    g.get("name"),
+                    idle_for,
+                )
+            else:
+                # Reessaye au tour suivant
+                next_due = now
+        except Exception as exc:
+            next_due = now
+            logger.exception("Idle clear erreur (%s): %s", g.get("name"), exc)
+    return next_due, False
+
+
+def _idle_due_after_packet(g, now, next_due, quiet, default_clear_s):
+    if quiet:
+        # Tout etait inactif: les groupes restes figes sont effaces au
+        # prochain tour, sans attendre le delai du groupe qui reprend
+        return now
+    clear_after = g["idle_clear_seconds"]
+    if clear_after is None:
+        clear_after = default_clear_s
+    return min(next_due, now + clear_after)
+
+
+def _has_session_state(sdk):
+    return sdk.CSS_Connected is not None
+
+
+def _query_session_state(sdk):
+    # None si l'etat n'est pas lisible -> repli sur get_devices
+    try:
+        state, err = sdk.get_session_state()
+    except Exception:
+        return None, None
+    if err != sdk.CE_Success:
+        return None, err
+    return state == sdk.CSS_Connected, err
+
+
 def wait_for_icue(sdk, device_type_mask, timeout_s=8.0):
-    start = time.time()
+    has_state = _has_session_state(sdk)
+    ok_code = sdk.CE_Success
+    start = time.monotonic()
     last_err = None
-    while time.time() - start < timeout_s:
-        try:
-            if sdk.CorsairSessionState is not None:
-                state, err = sdk.get_session_state()
+    while True:
+        connected = None
+        if has_state:
+            connected, err = _query_session_state(sdk)
+            if err is not None:
                 last_err = err
-                if err == sdk.CorsairError.CE_Success and hasattr(
-                    sdk.CorsairSessionState, "CSS_Connected"
-                ):
-                    if state == sdk.CorsairSessionState.CSS_Connected:
-                        return True, last_err
-        except Exception:
-            pass
-
-        try:
-            _, err = sdk.get_devices(device_type_mask)
-            last_err = err
-            if err == sdk.CorsairError.CE_Success:
-                return True, last_err
-        except Exception:
-            pass
+        if connected:
+            return True, last_err
+        if connected is None:
+            try:
+                _, err = sdk.get_devices(device_type_mask)
+                last_err = err
+                if err == ok_code:
+                    return True, last_err
+            except Exception:
+                pass
 
-        time.sleep(0.2)
+        remaining = timeout_s - (time.monotonic() - start)
+        if remaining <= 0:
+            break
+        time.sleep(min(0.2, remaining))
     return False, last_err
 
 
 def is_icue_connected(sdk, device_type_mask):
-    try:
-        if sdk.CorsairSessionState is not None:
-            state, err = sdk.get_session_state()
-            if err == sdk.CorsairError.CE_Success and hasattr(
-                sdk.CorsairSessionState, "CSS_Connected"
-            ):
-                return state == sdk.CorsairSessionState.CSS_Connected
-    except Exception:
-        pass
+    if _has_session_state(sdk):
+        connected, _ = _query_session_state(sdk)
+        if connected is not None:
+            return connected
     try:
         _, err = sdk.get_devices(device_type_mask)
-        return err == sdk.CorsairError.CE_Success
+        return err == sdk.CE_Success
     except Exception:
         return False
 
@@ -2705,7 +3128,7 @@ def build_mapper(cfg, sdk, device_type_mask, args):
     mapper.enumerate(cfg.get("clear_on_start", True))
 
     if cfg.get("keyboard_serpentine"):
-        keyboard_types = parse_device_types(["CDT_Keyboard"], sdk)
+        keyboard_types = _device_type_set(sdk, "CDT_Keyboard")
         mapper.apply_serpentine(
             keyboard_types,
             row_tolerance=cfg.get("keyboard_serpentine_row_tolerance"),
@@ -2717,7 +3140,7 @@ def build_mapper(cfg, sdk, device_type_mask, args):
             swap_xy=cfg.get("keyboard_serpentine_swap_xy", False),
             mode=cfg.get("keyboard_serpentine_mode", "serpentine"),
         )
-    ram_types = parse_device_types(["CDT_MemoryModule"], sdk)
+    ram_types = _device_type_set(sdk, "CDT_MemoryModule")
     if cfg.get("ram_serpentine"):
         mapper.apply_serpentine(
             ram_types,
@@ -2753,7 +3176,7 @@ def build_mapper(cfg, sdk, device_type_mask, args):
             swap_xy=cfg.get("fan_swap_xy", False),
         )
     if cfg.get("aio_cluster"):
-        aio_types = parse_device_types(["CDT_Cooler"], sdk)
+        aio_types = _device_type_set(sdk, "CDT_Cooler")
         mapper.apply_aio_cluster(
             aio_types,
             cluster_count=cfg.get("aio_cluster_count", 3),
@@ -2766,7 +3189,7 @@ def build_mapper(cfg, sdk, device_type_mask, args):
             swap_xy=cfg.get("aio_swap_xy", False),
             pump_first=cfg.get("aio_pump_first", False),
         )
-    mat_types = parse_device_types(["CDT_Mousemat"], sdk)
+    mat_types = _device_type_set(sdk, "CDT_Mousemat")
     mousemat_mode = (cfg.get("mousemat_order_mode") or "serpentine").lower()
     if mousemat_mode == "index":
         mapper.apply_index_order(
@@ -2801,6 +3224,14 @@ def build_mapper(cfg, sdk, device_type_mask, args):
     return mapper
 
 
+def _set_cpu_affinity(cores):
+    # stdlib si dispo (Linux), psutil sinon (Windows)
+    if _HAS_SCHED_AFFINITY:
+        os.sched_setaffinity(0, set(cores))
+    else:
+        psutil.Process().cpu_affinity(list(cores))
+
+
 def run_bridge(args):
     cfg_path = _resolve_config_path(args.config)
     try:
@@ -2840,12 +3271,11 @@ def run_bridge(args):
         pass
     cpu_affinity_core = cfg.get("cpu_affinity_core", -1)
     if cpu_affinity_core is not None:
-        if not _HAS_PSUTIL:
+        if not _HAS_SCHED_AFFINITY and not _HAS_PSUTIL:
             logger.warning("Affinite CPU demandee mais psutil indisponible.")
         else:
             try:
-                p = psutil.Process()
-                cpu_count = psutil.cpu_count()
+                cpu_count = os.cpu_count()
                 if not cpu_count:
                     raise RuntimeError("Nombre de coeurs indisponible.")
                 all_cpus = list(range(cpu_count))
@@ -2860,7 +3290,7 @@ def run_bridge(args):
                         )
                     else:
                         dedicated_core = [all_cpus[-1]]
-                        p.cpu_affinity(dedicated_core)
+                        _set_cpu_affinity(dedicated_core)
                         logger.info("Affinite CPU definie sur coeur %s", dedicated_core)
                 else:
                     if core_index < 0 or core_index >= len(all_cpus):
@@ -2868,7 +3298,7 @@ def run_bridge(args):
                             f"cpu_affinity_core invalide (0..{len(all_cpus) - 1})."
                         )
                     dedicated_core = [core_index]
-                    p.cpu_affinity(dedicated_core)
+                    _set_cpu_affinity(dedicated_core)
                     logger.info("Affinite CPU definie sur coeur %s", dedicated_core)
             except Exception as exc:
                 logger.warning("Impossible de definir l'affinite CPU : %s", exc)
@@ -2895,7 +3325,10 @@ def run_bridge(args):
 
         def worker():
             try:
-                info = _fetch_latest_release(update_repo)
+                info = _fetch_latest_release(
+                    update_repo,
+                    max_age=min(update_interval, _RELEASE_CACHE_MAX_AGE),
+                )
                 latest = info.get("version")
                 if latest and _is_newer_version(latest, APP_VERSION):
                     with update_lock:
@@ -2914,14 +3347,14 @@ def run_bridge(args):
 
     logger.info("Connexion iCUE SDK...")
     err = sdk.connect()
-    if err != sdk.CorsairError.CE_Success:
+    if err != sdk.CE_Success:
         logger.error("Connexion iCUE SDK echouee: %s", err)
         print(f"Connexion iCUE SDK echouee: {err}")
         return 1
     ok, last_err = wait_for_icue(sdk, device_type_mask)
     if not ok:
         msg = "iCUE non connecte (CE_NotConnected)"
-        if last_err is not None and last_err != sdk.CorsairError.CE_Success:
+        if last_err is not None and last_err != sdk.CE_Success:
             msg = f"iCUE non connecte: {last_err}"
         logger.error(msg)
         print(msg)
@@ -2947,7 +3380,7 @@ def run_bridge(args):
             )
         return 0
 
-    lut = build_lut(cfg.get("brightness", 1.0), cfg.get("gamma", 1.0))
+    lut = build_lut_bytes(cfg.get("brightness", 1.0), cfg.get("gamma", 1.0))
     if args.test or args.test_color:
         color = (255, 0, 0)
         if args.test_color:
@@ -2956,11 +3389,7 @@ def run_bridge(args):
                 print("Couleur invalide. Exemple: --test-color 255,0,0")
                 return 1
             color = parsed
-        frame = bytearray(mapper.total_leds * 3)
-        for i in range(0, len(frame), 3):
-            frame[i] = color[0]
-            frame[i + 1] = color[1]
-            frame[i + 2] = color[2]
+        frame = bytearray(bytes(color) * mapper.total_leds)
         mapper.apply_frame(frame, lut=lut)
         print(f"Test LEDs applique: {color[0]},{color[1]},{color[2]}")
         logger.info("Test LEDs applique: %s,%s,%s", color[0], color[1], color[2])
@@ -2979,8 +3408,11 @@ def run_bridge(args):
     mode = choose_mode(cfg, args, prompt_allowed=prompt_allowed)
 
     default_protocol = normalize_protocol(cfg.get("protocol"), "drgb")
+    groups_cache = {}
     try:
-        groups = get_groups_for_mode(mode, cfg, mapper, sdk, default_protocol, args)
+        groups = get_groups_for_mode(
+            mode, cfg, mapper, sdk, default_protocol, args, groups_cache
+        )
     except RuntimeError as exc:
         print(str(exc))
         print("Ajoute `groups` ou passe en mode groupe.")
@@ -3023,13 +3455,16 @@ def run_bridge(args):
             start = (fan_index - 1) * leds_per_fan
             end = min(len(target["map"]), start + leds_per_fan)
             print(f"Sweep ventilo {fan_index}/{fan_count} (LEDs {start}-{end-1})")
+            # Une seule trame reutilisee: on eteint la LED precedente
+            frame = bytearray(len(target["map"]) * 3)
+            prev = None
             try:
                 while True:
                     for i in range(start, end):
-                        frame = bytearray(len(target["map"]) * 3)
-                        frame[i * 3] = 255
-                        frame[i * 3 + 1] = 255
-                        frame[i * 3 + 2] = 255
+                        if prev is not None:
+                            frame[prev * 3:prev * 3 + 3] = b"\x00\x00\x00"
+                        frame[i * 3:i * 3 + 3] = b"\xff\xff\xff"
+                        prev = i
                         mapper.apply_frame_map(
                             target["map"],
                             target["device_ids"],
@@ -3039,7 +3474,7 @@ def run_bridge(args):
                         )
                         time.sleep(max(0.01, float(args.fan_speed)))
             except KeyboardInterrupt:
-                frame = bytearray(len(target["map"]) * 3)
+                _clear_tail(frame, 0)
                 mapper.apply_frame_map(
                     target["map"],
                     target["device_ids"],
@@ -3054,16 +3489,15 @@ def run_bridge(args):
                 print("fan_on invalide. Exemple: --fan-on 1,2")
                 return 1
             color = parse_rgb(args.fan_color) or (255, 255, 255)
+            pixel = bytes(color)
             frame = bytearray(len(target["map"]) * 3)
             for fan_index in indices:
                 if fan_index < 1 or fan_index > fan_count:
                     continue
                 start = (fan_index - 1) * leds_per_fan
                 end = min(len(target["map"]), start + leds_per_fan)
-                for i in range(start, end):
-                    frame[i * 3] = color[0]
-                    frame[i * 3 + 1] = color[1]
-                    frame[i * 3 + 2] = color[2]
+                if end > start:
+                    frame[start * 3:end * 3] = pixel * (end - start)
             mapper.apply_frame_map(
                 target["map"],
                 target["device_ids"],
@@ -3075,7 +3509,12 @@ def run_bridge(args):
             return 0
 
     debug_udp = args.debug_udp
-    sel, runtime_groups = setup_runtime(groups)
+    try:
+        udp_rcvbuf = max(0, int(cfg.get("udp_rcvbuf", _UDP_RCVBUF)))
+    except Exception:
+        udp_rcvbuf = _UDP_RCVBUF
+    sel, runtime_groups = setup_runtime(groups, udp_rcvbuf)
+    mapper.prepare_maps(runtime_groups, lut)
     if not runtime_groups:
         print("Aucun groupe valide. Verifie la config.")
         logger.error("Aucun groupe valide.")
@@ -3120,8 +3559,24 @@ def run_bridge(args):
     apply_fail_threshold = int(cfg.get("icue_apply_fail_threshold", 6))
     last_watchdog = time.monotonic()
     last_stats_log = time.monotonic()
+    # Niveau de log fixe pour la session: stats par groupe inutiles sans INFO
+    stats_log_enabled = logger.isEnabledFor(logging.INFO)
     last_keepalive = time.monotonic()
     last_request_control = time.monotonic()
+    # Prochaine echeance keepalive: evite de parcourir les groupes a chaque tour
+    keepalive_next_due = 0.0
+    keepalive_groups = None
+    # Idem pour le clear idle: recalculee au passage et a chaque paquet recu
+    idle_next_due = 0.0
+    idle_groups = None
+    # Dernier passage idle sans groupe actif: le prochain paquet le relance
+    idle_quiet = False
+    # Dernier paquet tous groupes confondus (watchdog en O(1))
+    last_any_packet_ts = 0.0
+    # Clavier console (touche M) sonde au plus toutes les 100 ms
+    last_kbd_check = 0.0
+    debug_next_due = 0.0
+    debug_groups = None
     last_reconnect = 0.0
     watchdog_fail_count = 0
 
@@ -3145,10 +3600,15 @@ def run_bridge(args):
             pass
         try:
             new_mapper = build_mapper(cfg, sdk, device_type_mask, args)
+            # Nouveau mapper: les groupes en cache ne sont plus valides
+            groups_cache.clear()
             new_groups = get_groups_for_mode(
-                mode, cfg, new_mapper, sdk, default_protocol, args
+                mode, cfg, new_mapper, sdk, default_protocol, args, groups_cache
             )
-            new_sel, new_runtime_groups = setup_runtime(new_groups)
+            new_sel, new_runtime_groups = setup_runtime(
+                new_groups, udp_rcvbuf, prior=runtime_groups
+            )
+            new_mapper.prepare_maps(new_runtime_groups, lut)
         except Exception as exc:
             logger.exception("Rebuild apres reconnexion echoue: %s", exc)
             print(f"Rebuild apres reconnexion echoue: {exc}")
@@ -3184,16 +3644,17 @@ def run_bridge(args):
         mode = new_mode
         try:
             groups = get_groups_for_mode(
-                mode, cfg, mapper, sdk, default_protocol, args
+                mode, cfg, mapper, sdk, default_protocol, args, groups_cache
             )
         except RuntimeError as exc:
             print(str(exc))
             print("Reste en mode actuel.")
             groups = get_groups_for_mode(
-                "group", cfg, mapper, sdk, default_protocol, args
+                "group", cfg, mapper, sdk, default_protocol, args, groups_cache
             )
             mode = "group"
-        sel, runtime_groups = setup_runtime(groups)
+        sel, runtime_groups = setup_runtime(groups, udp_rcvbuf)
+        mapper.prepare_maps(runtime_groups, lut)
         print("Groupes actifs:")
         for gg in runtime_groups:
             print(
@@ -3208,9 +3669,14 @@ def run_bridge(args):
                 gg["led_count"],
                 gg["protocol"],
             )
+    # Tampon de reception unique: les groupes sont traites l'un apres
+    # l'autre et chaque parseur copie le paquet avant le recv suivant
+    recv_buf = bytearray(65535)
+    recv_view = memoryview(recv_buf)
     try:
         while True:
             events = sel.select(timeout=0.5)
+            tick_groups = runtime_groups
             now = time.monotonic()
             if update_enabled and is_repo_configured(update_repo):
                 if (now - update_last_check) >= update_interval:
@@ -3248,29 +3714,51 @@ def run_bridge(args):
                 except Exception as exc:
                     logger.warning("iCUE periodic request_control echoue: %s", exc)
                 last_request_control = now
-            any_active_recent = any(
-                (g.get("last_packet_ts", 0.0) and (now - g.get("last_packet_ts", 0.0)) < (g.get("keepalive_interval") or keepalive_interval))
-                for g in runtime_groups
-            )
-            if keepalive_enabled:
-                due_groups = []
+            due_groups = []
+            # None: pas encore calcule ce tour (le scan keepalive le fournit)
+            any_active_recent = None
+            if keepalive_enabled and (
+                now >= keepalive_next_due or keepalive_groups is not runtime_groups
+            ):
+                keepalive_groups = runtime_groups
+                keepalive_next_due = float("inf")
+                any_active_recent = False
                 for g in runtime_groups:
-                    interval = g.get("keepalive_interval") or keepalive_interval
-                    if now - g.get("last_keepalive", 0.0) < interval:
+                    interval = g["keepalive_interval"] or keepalive_interval
+                    last_pkt = g["last_packet_ts"]
+                    if last_pkt and (now - last_pkt) < interval:
+                        any_active_recent = True
+                    due_at = g["last_keepalive"] + interval
+                    if now < due_at:
+                        keepalive_next_due = min(keepalive_next_due, due_at)
                         continue
                     g["last_keepalive"] = now
-                    if g.get("keepalive_reapply", None) is False:
+                    keepalive_next_due = min(keepalive_next_due, now + interval)
+                    if g["keepalive_reapply"] is False:
                         continue
-                    last_pkt = g.get("last_packet_ts", 0.0)
                     if not last_pkt:
                         continue
                     if (now - last_pkt) < interval:
                         continue
-                    if g.get("last_send", 0.0) <= 0:
+                    if g["last_send"] <= 0:
                         continue
                     due_groups.append((g, interval))
 
-                if due_groups and keepalive_request_always:
+            idle_due = unique_idle_clear_enabled and (
+                now >= idle_next_due or idle_groups is not runtime_groups
+            )
+            if any_active_recent is None:
+                any_active_recent = False
+                if idle_due:
+                    for g in runtime_groups:
+                        last_pkt = g["last_packet_ts"]
+                        if last_pkt and (now - last_pkt) < (
+                            g["keepalive_interval"] or keepalive_interval
+                        ):
+                            any_active_recent = True
+                            break
+            if due_groups:
+                if keepalive_request_always:
                     try:
                         sdk.request_control()
                         logger.info("iCUE keepalive: request_control")
@@ -3280,15 +3768,9 @@ def run_bridge(args):
                 if keepalive_reapply:
                     for g, interval in due_groups:
                         try:
-                            ok = mapper.apply_frame_map(
-                                g["map"],
-                                g["device_ids"],
-                                g["frame_buffer"],
-                                lut=lut,
-                                update_mode=g.get("update_mode", "auto"),
-                            )
+                            ok = g["apply_frame"](g["frame_buffer"], defer_flush=True)
                             if not ok:
-                                g["fail_count"] = g.get("fail_count", 0) + 1
+                                g["fail_count"] += 1
                                 if g["fail_count"] >= apply_fail_threshold:
                                     g["fail_count"] = 0
                                     if skip_reconnect_when_idle and not any_active_recent:
@@ -3305,50 +3787,19 @@ def run_bridge(args):
                                 )
                             else:
                                 attempt_reconnect("keepalive_error")
-            if unique_idle_clear_enabled and any_active_recent:
-                for g in runtime_groups:
-                    if g.get("idle_clear_disabled", False):
-                        continue
-                    clear_after = g.get("idle_clear_seconds")
-                    if clear_after is None:
-                        clear_after = unique_idle_clear_s
-                    last_pkt = g.get("last_packet_ts", 0.0)
-                    if not last_pkt:
-                        continue
-                    idle_for = now - last_pkt
-                    if idle_for < clear_after:
-                        continue
-                    if g.get("idle_cleared", False):
-                        continue
+                    # Un seul flush iCUE pour tous les groupes rafraichis
                     try:
-                        frame = g.get("frame_buffer")
-                        if frame is None:
-                            continue
-                        frame[:] = b"\x00" * len(frame)
-                        ok = mapper.apply_frame_map(
-                            g["map"],
-                            g["device_ids"],
-                            frame,
-                            lut=lut,
-                            update_mode=g.get("update_mode", "auto"),
-                        )
-                        if ok:
-                            g["last_send"] = now
-                            g["fail_count"] = 0
-                            g["idle_cleared"] = True
-                            logger.info(
-                                "UDP[%s]: clear idle apres %.1fs",
-                                g.get("name"),
-                                idle_for,
-                            )
+                        mapper.flush_pending()
                     except Exception as exc:
-                        logger.exception("Idle clear erreur (%s): %s", g.get("name"), exc)
+                        logger.warning("Keepalive flush echoue: %s", exc)
+            if idle_due:
+                idle_groups = runtime_groups
+                idle_next_due, idle_quiet = _idle_clear_pass(
+                    runtime_groups, now, any_active_recent, unique_idle_clear_s, logger
+                )
             if watchdog_enabled and now - last_watchdog >= watchdog_interval:
                 last_watchdog = now
-                active_recent = any(
-                    (now - g.get("last_packet_ts", 0.0)) < watchdog_interval
-                    for g in runtime_groups
-                )
+                active_recent = (now - last_any_packet_ts) < watchdog_interval
                 if watchdog_idle_only and active_recent:
                     watchdog_fail_count = 0
                 else:
@@ -3366,12 +3817,12 @@ def run_bridge(args):
                             attempt_reconnect("watchdog")
                     else:
                         watchdog_fail_count = 0
-            if now - last_stats_log >= 10.0:
+            if stats_log_enabled and now - last_stats_log >= 10.0:
                 last_stats_log = now
                 for g in runtime_groups:
-                    last_pkt = g.get("last_packet_ts", 0.0)
+                    last_pkt = g["last_packet_ts"]
                     idle = None if not last_pkt else (now - last_pkt)
-                    last_send = g.get("last_send", 0.0)
+                    last_send = g["last_send"]
                     last_send_delta = None if not last_send else (now - last_send)
                     logger.info(
                         "UDP[%s]: idle %s, last_send=%s, leds=%s",
@@ -3380,7 +3831,11 @@ def run_bridge(args):
                         "never" if last_send_delta is None else f"{last_send_delta:.1f}s ago",
                         g.get("led_count"),
                     )
-            if debug_udp:
+            if debug_udp and (
+                now >= debug_next_due or debug_groups is not runtime_groups
+            ):
+                debug_groups = runtime_groups
+                debug_next_due = float("inf")
                 for g in runtime_groups:
                     if now - g["stats_ts"] >= 1.0:
                         if g["pkt_count"] == 0:
@@ -3394,88 +3849,137 @@ def run_bridge(args):
                         g["pkt_count"] = 0
                         g["byte_count"] = 0
                         g["stats_ts"] = now
+                    debug_next_due = min(debug_next_due, g["stats_ts"] + 1.0)
 
+            if runtime_groups is not tick_groups:
+                # Reconnexion/changement de mode pendant ce tour: les events
+                # pointent vers les anciens groupes (et l'ancien mapper).
+                # Les paquets restent en file pour le prochain select.
+                continue
+            ready = []
             for key, _ in events:
                 sock = key.fileobj
                 g = key.data
-                try:
-                    data, _ = sock.recvfrom(65535)
-                except Exception:
-                    continue
-
-                if g["first_packet"]:
-                    g["first_packet"] = False
-                    proto_hex = f"0x{data[0]:02x}" if data else "n/a"
-                    print(
-                        f"Premier paquet UDP recu pour {g['name']}: "
-                        f"{len(data)} octets, byte0={proto_hex}"
-                    )
-                    logger.info(
-                        "Premier paquet UDP recu pour %s: %s octets, byte0=%s",
-                        g["name"],
-                        len(data),
-                        proto_hex,
-                    )
-
-                if debug_udp:
-                    g["pkt_count"] += 1
-                    g["byte_count"] += len(data)
-                g["last_packet_ts"] = now
-                g["idle_cleared"] = False
-
                 protocol = g["protocol"]
+                # Protocole resolu une fois par socket, pas a chaque paquet
+                always_ddp = protocol == "ddp"
+                detect_ddp = protocol in ("auto", "wled")
+                raw_only = protocol == "raw"
                 frame_buffer = g["frame_buffer"]
-                ddp_like = looks_like_ddp(data)
-                if protocol == "ddp" or (
-                    protocol in ("auto", "wled") and ddp_like
-                ):
-                    if protocol == "wled" and ddp_like and not g.get("ddp_auto"):
-                        g["ddp_auto"] = True
+                push = False
+                # Vide la file du socket: une seule mise a jour iCUE pour
+                # toutes les trames en attente (arret apres un push DDP)
+                for _ in range(_UDP_DRAIN_MAX):
+                    try:
+                        data = recv_view[:sock.recv_into(recv_buf)]
+                    except OSError:
+                        # File vide (EWOULDBLOCK) ou reset ICMP sous Windows
+                        break
+
+                    if g["first_packet"]:
+                        g["first_packet"] = False
+                        proto_hex = f"0x{data[0]:02x}" if data else "n/a"
+                        print(
+                            f"Premier paquet UDP recu pour {g['name']}: "
+                            f"{len(data)} octets, byte0={proto_hex}"
+                        )
                         logger.info(
-                            "DDP detecte sur %s (auto-detection activee pour wled).",
-                            g.get("name"),
+                            "Premier paquet UDP recu pour %s: %s octets, byte0=%s",
+                            g["name"],
+                            len(data),
+                            proto_hex,
                         )
-                    push = parse_ddp(data, frame_buffer)
-                    if not push:
+
+                    if debug_udp:
+                        g["pkt_count"] += 1
+                        g["byte_count"] += len(data)
+                    g["last_packet_ts"] = now
+                    last_any_packet_ts = now
+                    g["idle_cleared"] = False
+
+                    if always_ddp or (detect_ddp and looks_like_ddp(data)):
+                        if protocol == "wled" and not g["ddp_auto"]:
+                            g["ddp_auto"] = True
+                            logger.info(
+                                "DDP detecte sur %s (auto-detection activee pour wled).",
+                                g.get("name"),
+                            )
+                        # Entete DDP incomplet (protocole force): paquet ignore
+                        if len(data) >= 10 and parse_ddp(data, frame_buffer):
+                            push = True
+                            break
                         continue
-                elif protocol == "wled":
-                    parse_wled_or_raw(data, frame_buffer)
-                elif protocol == "raw":
-                    if len(data) % 3 == 0:
-                        frame_buffer[: min(len(frame_buffer), len(data))] = data[
-                            : len(frame_buffer)
-                        ]
-                    else:
+                    if raw_only:
+                        if len(data) % 3 == 0:
+                            frame_buffer[: min(len(frame_buffer), len(data))] = data[
+                                : len(frame_buffer)
+                            ]
+                            push = True
                         continue
-                else:
                     parse_wled_or_raw(data, frame_buffer)
+                    push = True
 
+                if unique_idle_clear_enabled and g["last_packet_ts"] == now:
+                    idle_next_due = _idle_due_after_packet(
+                        g, now, idle_next_due, idle_quiet, unique_idle_clear_s
+                    )
+                    idle_quiet = False
+                if not push:
+                    continue
                 if min_interval and now - g["last_send"] < min_interval:
                     continue
                 g["last_send"] = now
+                ready.append(g)
+
+            # Tous les sockets prets sont vides avant d'appeler iCUE: une
+            # mise a jour par groupe puis un seul flush pour le tour
+            # Groupes partageant un device (meme mode): seul le dernier du
+            # tour l'envoie a iCUE, les precedents ne font que remplir
+            skips = [None] * len(ready)
+            if len(ready) > 1:
+                later = {}
+                for i in range(len(ready) - 1, -1, -1):
+                    g = ready[i]
+                    seen = later.setdefault(g["update_mode"], set())
+                    shared = seen.intersection(g["device_ids"])
+                    if shared:
+                        skips[i] = shared
+                    seen.update(g["device_ids"])
+            apply_mapper = mapper
+            for g, skip in zip(ready, skips):
+                if mapper is not apply_mapper:
+                    # Reconnexion en cours de tour: groupes obsoletes
+                    break
                 try:
-                    ok = mapper.apply_frame_map(
-                        g["map"],
-                        g["device_ids"],
-                        frame_buffer,
-                        lut=lut,
-                        update_mode=g.get("update_mode", "auto"),
+                    ok = g["apply_frame"](
+                        g["frame_buffer"], defer_flush=True, skip_push=skip
                     )
                     if ok:
                         g["fail_count"] = 0
                     else:
-                        g["fail_count"] = g.get("fail_count", 0) + 1
+                        g["fail_count"] += 1
                         if g["fail_count"] >= apply_fail_threshold:
                             g["fail_count"] = 0
                             attempt_reconnect("apply_no_success")
                 except Exception as exc:
                     logger.exception("apply_frame_map erreur: %s", exc)
                     attempt_reconnect("apply_frame_map_error")
-            if _HAS_MSVCRT and prompt_allowed and msvcrt.kbhit():
-                key = msvcrt.getwch()
-                if key in ("m", "M"):
-                    if _MODE_WINDOW is None or not _MODE_WINDOW.available:
-                        apply_mode_change(prompt_mode(mode))
+            if ready and mapper is apply_mapper:
+                try:
+                    mapper.flush_pending()
+                except Exception as exc:
+                    logger.warning("Flush iCUE echoue: %s", exc)
+            if (
+                _HAS_MSVCRT
+                and prompt_allowed
+                and now - last_kbd_check >= 0.1
+            ):
+                last_kbd_check = now
+                if msvcrt.kbhit():
+                    key = msvcrt.getwch()
+                    if key in ("m", "M"):
+                        if _MODE_WINDOW is None or not _MODE_WINDOW.available:
+                            apply_mode_change(prompt_mode(mode))
     except KeyboardInterrupt:
         print("Arret.")
         logger.info("Arret.")
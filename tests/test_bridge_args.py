@@ -0,0 +1,18 @@
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+import ledfx_icue_bridge as bridge
+
+
+def test_fast_path_matches_parser_defaults():
+    fast = bridge._parse_args_fast([])
+    parsed = bridge.build_arg_parser().parse_args([])
+    assert vars(fast) == vars(parsed)
+
+
+def test_fast_path_config_only():
+    fast = bridge._parse_args_fast(["--config", "autre.json"])
+    parsed = bridge.build_arg_parser().parse_args(["--config", "autre.json"])
+    assert vars(fast) == vars(parsed)
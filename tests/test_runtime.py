@@ -0,0 +1,73 @@
+import logging
+import pathlib
+import socket
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+import ledfx_icue_core as core
+
+
+def _free_port():
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+def _group(name, port, led_count):
+    return {
+        "name": name,
+        "udp_host": "127.0.0.1",
+        "udp_port": port,
+        "led_count": led_count,
+        "protocol": "wled",
+    }
+
+
+def test_same_name_groups_get_distinct_frame_buffers():
+    groups = [_group("ram", _free_port(), 4), _group("ram", _free_port(), 4)]
+    sel, runtime_groups = core.setup_runtime(groups)
+    try:
+        first, second = (g["frame_buffer"] for g in runtime_groups)
+        assert first is not second
+        first[:3] = b"\xff\x00\x7f"
+        assert bytes(second) == bytes(12)
+    finally:
+        core.close_runtime(sel, runtime_groups)
+
+
+def test_idle_clear_runs_at_once_when_one_group_resumes():
+    logger = logging.getLogger("bridge")
+    applied = []
+    groups = []
+    for name in ("a", "b"):
+        groups.append(
+            {
+                "name": name,
+                "idle_clear_disabled": False,
+                "idle_cleared": False,
+                "idle_clear_seconds": None,
+                "last_packet_ts": 1.0,
+                "last_send": 1.0,
+                "fail_count": 0,
+                "frame_buffer": bytearray(b"\xff" * 6),
+                "apply_frame": lambda frame, name=name: applied.append(name) or True,
+            }
+        )
+    a, b = groups
+
+    # Les deux groupes se taisent: aucun groupe actif, pas d'echeance
+    due, quiet = core._idle_clear_pass(groups, 10.0, False, 1.0, logger)
+    assert due == float("inf") and quiet
+    assert applied == []
+
+    # Seul a reprend: b doit etre efface au tour suivant, pas apres 1 s
+    a["last_packet_ts"] = 10.5
+    due = core._idle_due_after_packet(a, 10.5, due, quiet, 1.0)
+    assert due == 10.5
+    due, quiet = core._idle_clear_pass(groups, 10.5, True, 1.0, logger)
+    assert applied == ["b"]
+    assert b["idle_cleared"] and bytes(b["frame_buffer"]) == bytes(6)
+    assert not a["idle_cleared"] and due == 11.5 and not quiet